@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from browser.txschools_scraper import TXSchoolsScraper
+from browser.provider.browser_session import get_process_tree_rss_mb
+from tools.fixture_site import FixtureSite, generate_schools, load_recorded_schools, ERROR, HANG
+
+parser = argparse.ArgumentParser(description="Benchmark TXSchoolsScraper end to end against a local replica of the TX Schools site.")
+parser.add_argument("--schools", type=int, default=100, help="Number of synthetic schools to serve.")
+parser.add_argument("--recordings", help="Serve the detail pages recorded in this capture archive (captured with 'capture.html') instead of synthetic ones.")
+parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response and listing update.")
+parser.add_argument("--jitter", type=float, default=0, help="Up to this many random seconds added on top of the latency.")
+parser.add_argument("--failure-rate", type=float, default=0, help="Fraction of the detail pages that fail.")
+parser.add_argument("--failure-mode", choices=[ERROR, HANG], default=ERROR, help="'error' answers 503 with an empty page, 'hang' answers after --hang-seconds.")
+parser.add_argument("--hang-seconds", type=float, default=30)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--workers", type=int, help="Override the 'concurrency.workers' config.")
+parser.add_argument("--orchestrator", choices=["threads", "asyncio"], help="Override the 'concurrency.orchestrator' config.")
+parser.add_argument("--engine", choices=["browser", "http"], help="Override the 'extraction.engine' config.")
+parser.add_argument("--requests-per-second", type=float, default=1000, help="Rate limit of the fixture host, lifted by default.")
+parser.add_argument("--output", default="benchmark_report.json", help="File receiving the JSON report.")
+parser.add_argument("--baseline", help="Report of a previous run: exit with status 1 if this run regressed against it.")
+parser.add_argument("--max-regression", type=float, default=0.1, help="Tolerated fraction of throughput loss (and p95 latency growth) against the baseline.")
+args = parser.parse_args()
+
+
+class ResourceSampler:
+    """Samples the memory of this process and its browsers, and the number of live browsers, on a background thread."""
+
+    def __init__(self, scraper, interval: float = 0.25):
+        self.scraper = scraper
+        self.interval = interval
+        self.peak_rss_mb = 0
+        self.peak_browsers = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval):
+                return
+
+    def sample(self):
+        rss = get_process_tree_rss_mb(os.getpid())
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        sessions = list(self.scraper.session_manager.sessions) if self.scraper.session_manager is not None else []
+        self.peak_browsers = max(self.peak_browsers, sum(1 for session in sessions if session.started))
+
+
+def quantile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+
+def configure(scraper, site):
+    """Point the scraper at the fixture site and apply the command line overrides."""
+    configs = scraper.configs
+    configs["link"]["path"] = site.listing_url
+    configs["script"]["before"] = {"goto": site.listing_url}
+    configs["rate_limit"]["requests_per_second"] = args.requests_per_second
+    configs["rate_limit"]["burst"] = max(configs["rate_limit"]["burst"], args.requests_per_second)
+    if args.workers:
+        configs["concurrency"]["workers"] = args.workers
+    if args.orchestrator:
+        configs["concurrency"]["orchestrator"] = args.orchestrator
+    if args.engine:
+        configs["extraction"]["engine"] = args.engine
+        scraper.http_provider = scraper._get_http_provider()
+
+
+def run_benchmark(schools):
+    latencies = []
+    with FixtureSite(schools, args.latency, args.jitter, args.failure_rate, args.failure_mode, args.hang_seconds, seed=args.seed) as site:
+        # Every output file of the run goes to a scratch directory, so the real data files are never touched.
+        with tempfile.TemporaryDirectory(prefix="txschools_benchmark_") as scratch_dir:
+            working_dir = os.getcwd()
+            os.chdir(scratch_dir)
+            try:
+                scraper = TXSchoolsScraper()
+                configure(scraper, site)
+                scrape_url = scraper._scrape_url
+
+                def timed_scrape_url(url):
+                    started = time.perf_counter()
+                    scrape_url(url)
+                    latencies.append(time.perf_counter() - started)
+
+                scraper._scrape_url = timed_scrape_url
+                with ResourceSampler(scraper) as sampler:
+                    started = time.perf_counter()
+                    scraper.scrape()
+                    elapsed = time.perf_counter() - started
+            finally:
+                os.chdir(working_dir)
+
+    sessions = scraper.session_manager.sessions if scraper.session_manager is not None else []
+    counters = {name: count for (name, _), count in scraper.metrics.counters.items()}
+    return {
+        "schools": len(schools),
+        "pages_scraped": len(latencies),
+        "pages_failed": len(scraper.failed_urls),
+        "elapsed_seconds": round(elapsed, 3),
+        "pages_per_second": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "latency_p50": quantile(latencies, 0.5),
+        "latency_p95": quantile(latencies, 0.95),
+        "peak_rss_mb": round(sampler.peak_rss_mb, 1),
+        "browser_sessions": len(sessions),
+        "browser_restarts": sum(session.restarts for session in sessions),
+        "peak_browsers": sampler.peak_browsers,
+        "retries": counters.get("retries_total", 0),
+        "site": site.stats,
+        "settings": {
+            "latency": args.latency, "jitter": args.jitter, "failure_rate": args.failure_rate, "failure_mode": args.failure_mode,
+            "workers": scraper.configs["concurrency"]["workers"], "orchestrator": scraper.configs["concurrency"]["orchestrator"],
+            "engine": scraper.configs["extraction"]["engine"]
+        }
+    }
+
+
+def find_regressions(report, baseline):
+    regressions = []
+    if baseline.get("pages_per_second") and report["pages_per_second"] < baseline["pages_per_second"] * (1 - args.max_regression):
+        regressions.append(f"throughput {report['pages_per_second']} pages/s < baseline {baseline['pages_per_second']} pages/s")
+    if baseline.get("latency_p95") and report["latency_p95"] and report["latency_p95"] > baseline["latency_p95"] * (1 + args.max_regression):
+        regressions.append(f"p95 latency {report['latency_p95']}s > baseline {baseline['latency_p95']}s")
+    return regressions
+
+
+schools = load_recorded_schools(args.recordings) if args.recordings else generate_schools(args.schools, args.seed)
+report = run_benchmark(schools)
+with open(args.output, "w") as file:
+    json.dump(report, file, indent=2)
+
+print(f"{report['pages_scraped']}/{report['schools']} pages in {report['elapsed_seconds']}s: {report['pages_per_second']} pages/s, "
+      f"p50 {report['latency_p50']}s, p95 {report['latency_p95']}s, peak RSS {report['peak_rss_mb']} MB, "
+      f"{report['browser_sessions']} browser sessions (peak {report['peak_browsers']} live, {report['browser_restarts']} restarts).")
+
+if args.baseline:
+    with open(args.baseline, "r") as file:
+        regressions = find_regressions(report, json.load(file))
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,681 @@
+import time
+import heapq
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+
+from browser.scrapers.default_scraper import AbstractScraper
+from browser.scrapers.paginator import Paginator
+from browser.scrapers.scraper_config import load_config, compile_detail_selectors
+from browser.provider.browser_pool import BrowserPool
+from browser.provider.crawl_orchestrator import CrawlOrchestrator
+from browser.provider.http_provider import HttpProvider
+from tools.checkpoint_store import CheckpointStore
+from tools.fingerprint_store import FingerprintStore, fingerprint
+from tools.retry_policy import RetryPolicy
+from browser.provider.browser_session import BrowserCrashedError, find_free_port
+from tools.checkpoint_store import DONE, FAILED
+from tools.capture_store import CaptureStore
+from tools.html_parser import extract_fields_from_html
+from tools.task_queue import get_task_queue, default_worker_id
+from tools.metrics import MetricsRegistry
+from tools.storage_backend import KEYED_BACKENDS
+from tools.record_pipeline import RawRecord, RecordBatch, RecordPipeline, batched
+
+DISCOVER_QUEUE = 'discover'
+ENRICH_QUEUE = 'enrich'
+
+class ConfigScraper(AbstractScraper):
+    """
+    Scraper of a school directory driven entirely by its site config: listing pagination, detail page fields,
+    storage and run modes. Sites needing custom post-processing subclass it and override 'post_process'.
+    """
+
+    def __init__(self, name: str, configs: dict = None, resume: bool = False, incremental: bool = False, capture: bool = False,
+                 browser_pool=None):
+        """
+        :param name: Name of the site config, in the 'configs' directory.
+        :param configs: Already loaded and validated config of the site, loaded from the 'configs' directory by default.
+        :param browser_pool: Optional SharedBrowserPool scraping the detail pages of several sites.
+        """
+        super().__init__()
+        self.name = name
+        try:
+            self.configs = configs if configs is not None else load_config(name)
+        except (OSError, ValueError) as e:
+            raise Exception(f"Failed to load scraper configuration: {e}") from e
+
+        if not self.configs:
+            raise Exception("Scraper configuration is empty.")
+
+        self.resource_policy = self.configs["resources"]
+        self.lifecycle = self.configs["lifecycle"]
+        self.column_types = self.configs["storage"]["column_types"]
+        self.indexed_columns = self.configs["storage"]["indexed_columns"]
+        self.detail_selectors = compile_detail_selectors(name, self.configs)
+        self.metrics = MetricsRegistry(trace_sample_rate=self.configs["metrics"]["trace_sample_rate"])
+        self.browser_pool = browser_pool
+        self._crash_requeues = {}
+
+        self.failed_urls = []
+        self.pipeline = None
+        self.http_provider = self._get_http_provider()
+        self.retry_policy = RetryPolicy(**self.configs["retry"])
+        self.checkpoint = CheckpointStore(self.configs["checkpoint"]["filename"], key_param=self.configs["checkpoint"]["key_param"])
+        self.resume = resume
+        self.execution_date = None
+        self.capture_store = self._get_capture_store() if capture or self.configs["capture"]["enabled"] else None
+        self.incremental = incremental
+        self.fingerprints = FingerprintStore(self.configs["incremental"]["filename"]) if incremental else None
+        self.listing_complete = False
+        self._listing_hashes = {}
+        self._validators = {}
+        self._unflushed_fingerprints = {}
+        self._fingerprints_lock = threading.Lock()
+
+    def _start_checkpoint(self):
+        """Reset the checkpoint for a fresh run, or restore the execution date of the run being resumed."""
+        execution_date = self.checkpoint.get_meta("execution_date") if self.resume else None
+        if execution_date:
+            logging.info(f"Resuming run from {execution_date}: {self.checkpoint.status_counts()}")
+            # URLs that failed before an interruption are only in the checkpoint: they go to the failed-URLs file of this run.
+            self.failed_urls.extend(self.checkpoint.urls_with_status(FAILED))
+            return execution_date
+        self.checkpoint.reset()
+        execution_date = datetime.now().isoformat()
+        self.checkpoint.set_meta("execution_date", execution_date)
+        return execution_date
+
+    def _get_capture_store(self):
+        return CaptureStore(self.configs["capture"]["filename"], key_param=self.configs["checkpoint"]["key_param"])
+
+    def _get_http_provider(self):
+        if self.configs["extraction"]["engine"] != "http":
+            return None
+        http_configs = self.configs["extraction"]["http"]
+        return HttpProvider(pool_size=max(http_configs["pool_size"], self.configs["concurrency"]["workers"]), timeout=http_configs["timeout"])
+
+    def scrape(self):
+        try:
+            self.execution_date = self._start_checkpoint()
+            self.execute_before(self.configs)
+            with self._open_record_pipeline() as self.pipeline:
+                self.execute_main()
+                if self.incremental:
+                    self._record_deletions()
+            self.execute_after()
+            if len(self.failed_urls_df) > 0: self.save_data(self.failed_urls_df, self.configs["storage"]["failed_filename"], self.configs["storage"]["failed_headers"])
+            if self.network_totals["pages"]:
+                logging.info(f"Network totals: {self.network_totals}")
+            print("Data saved to file.")
+        except Exception as e:
+            print(f"An error occurred during scraping: {e}")
+        finally:
+            self._export_metrics()
+
+    def _export_metrics(self):
+        metrics = self.configs["metrics"]
+        try:
+            self.metrics.export(metrics["filename"], metrics["format"], metrics["traces_filename"], labels={"execution_date": self.execution_date})
+        except Exception as e:
+            logging.warning(f"Unable to export metrics: {e}")
+
+    def _get_raw_target(self):
+        """Raw field rows are streamed to disk as pages are scraped; incremental runs only stream upserts and deletions."""
+        headers = ["School ID", "URL"] + self.configs["extraction"]["fields"]
+        if self.incremental:
+            return self.configs["incremental"]["raw_changes_filename"], headers + ["change_type", "execution_date"]
+        return self.configs["storage"]["raw_filename"], headers + ["execution_date"]
+
+    def _get_output_target(self):
+        """
+        Full snapshot rows go to the data file. Incremental runs only record upserts and deletions: in the data
+        store itself with a keyed backend, which applies them to the latest records, or else in the changes file.
+        """
+        storage = self.configs["storage"]
+        if self.incremental:
+            filename = storage["filename"] if storage["backend"] in KEYED_BACKENDS else self.configs["incremental"]["changes_filename"]
+            return filename, storage["headers"] + ["change_type", "execution_date"]
+        return storage["filename"], storage["headers"] + ["execution_date"]
+
+    @contextmanager
+    def _open_record_pipeline(self):
+        """
+        Stream the records of the run in batches: each batch is appended to the raw file, then post-processed
+        and appended to the output, so memory stays flat however many schools are scraped.
+        """
+        storage = self.configs["storage"]
+        raw_filename, raw_headers = self._get_raw_target()
+        output = self.get_storage(*self._get_output_target(), backend=storage["backend"])
+        try:
+            with self.open_data_writer(raw_filename, raw_headers, storage["batch_size"]) as raw_writer:
+                with RecordPipeline(
+                    self.configs["extraction"]["fields"],
+                    self.execution_date,
+                    [raw_writer.write_frame, lambda raw_df: self._save_processed_batch(output, raw_df)],
+                    batch_size=storage["batch_size"],
+                    change_types=self.incremental,
+                    on_flush=self._on_rows_flushed,
+                    metrics=self.metrics
+                ) as pipeline:
+                    yield pipeline
+        finally:
+            if hasattr(output, "close"):
+                output.close()
+
+    def _save_processed_batch(self, output, raw_df):
+        processed_df = self.post_process(raw_df)
+        if len(processed_df) > 0:
+            output.save_data(processed_df)
+
+    def _on_rows_flushed(self, urls):
+        """Mark URLs as done, and commit their fingerprints, only once their rows are on disk."""
+        self.checkpoint.mark_done(urls)
+        if self.fingerprints is None:
+            return
+        with self._fingerprints_lock:
+            pending = [(url, self._unflushed_fingerprints.pop(url, None)) for url in urls]
+        for url, values in pending:
+            if values is not None:
+                self.fingerprints.upsert(self.checkpoint.key(url), **values)
+
+    def retry_failed(self):
+        """Reprocess the URLs of the failed-URLs file that have not succeeded since they failed."""
+        try:
+            self.execution_date = datetime.now().isoformat()
+            storage = self.configs["storage"]
+            failed_df = self.read_data(storage["failed_filename"], storage["failed_headers"])
+            failed_urls = list(dict.fromkeys(failed_df[storage["failed_headers"][0]].dropna()))
+            succeeded_ids = self._get_succeeded_ids()
+            urls = [url for url in failed_urls if self.checkpoint.key(url) not in succeeded_ids]
+            logging.info(f"Retrying {len(urls)} of {len(failed_urls)} failed URLs.")
+
+            with self._open_record_pipeline() as self.pipeline:
+                try:
+                    self._access_urls(batched(urls, self.configs["concurrency"]["max_pending_urls"]))
+                finally:
+                    self._close_providers()
+            self.execute_after()
+            if len(self.failed_urls_df) > 0: self.save_data(self.failed_urls_df, storage["failed_filename"], storage["failed_headers"])
+            print(f"Recovered {len(urls) - len(self.failed_urls)} of {len(urls)} failed URLs.")
+        except Exception as e:
+            print(f"An error occurred while retrying failed URLs: {e}")
+        finally:
+            self._export_metrics()
+
+    def rerun_offline(self, execution_date=None):
+        """Rerun extraction and post-processing over the capture archive of a run, without a browser."""
+        try:
+            store = self.capture_store or self._get_capture_store()
+            self.execution_date = execution_date or store.latest_execution_date()
+            if not self.execution_date:
+                raise Exception("The capture archive is empty.")
+            logging.info(f"Re-extracting the pages captured on {self.execution_date}.")
+
+            storage = self.configs["storage"]
+            output = self.get_storage(self.configs["capture"]["offline_filename"], storage["headers"] + ["execution_date"], backend=storage["backend"])
+            try:
+                pipeline = RecordPipeline(
+                    self.configs["extraction"]["fields"],
+                    self.execution_date,
+                    [lambda raw_df: self._save_processed_batch(output, raw_df)],
+                    batch_size=storage["batch_size"],
+                    metrics=self.metrics
+                )
+                records = pipeline.consume(self._iter_captured_records(store))
+            finally:
+                store.close()
+                if hasattr(output, "close"):
+                    output.close()
+            print(f"Re-extracted {records} records, {len(self.failed_urls)} failed.")
+        except Exception as e:
+            print(f"An error occurred during the offline run: {e}")
+
+    def _iter_captured_records(self, store):
+        """Yield the raw record of every page captured in the run, re-extracted from its HTML when it was captured."""
+        for url, fields, html in store.iter_captures(self.execution_date, batch_size=self.configs["storage"]["batch_size"]):
+            try:
+                if html is not None:
+                    fields = {**fields, **self._extract_fields_from_capture(html)}
+                record = self._build_raw_record(url, fields)
+            except Exception as e:
+                print(f"Unable to process captured page: {e}")
+                self.failed_urls.append(url)
+                continue
+            yield record
+
+    def _extract_fields_from_capture(self, html):
+        fields = extract_fields_from_html(html, self.detail_selectors, self.configs["extraction"]["attributes"])
+        return {field: value for field, value in fields.items() if value is not None}
+
+    def _get_task_queue(self):
+        distributed = self.configs["distributed"]
+        max_attempts = self.configs["retry"]["max_attempts"] + self.configs["lifecycle"]["max_crash_requeues"]
+        return get_task_queue(distributed["backend"], distributed["filename"], max_attempts=max_attempts)
+
+    def schedule_crawl(self):
+        """Queue the discovery of a new crawl, for the discovery workers."""
+        queue = self._get_task_queue()
+        try:
+            execution_date = datetime.now().isoformat()
+            queue.enqueue(DISCOVER_QUEUE, [(execution_date, {"execution_date": execution_date})])
+            print(f"Crawl {execution_date} scheduled.")
+        finally:
+            queue.close()
+
+    def run_discovery_worker(self, worker_id=None):
+        """Lease scheduled crawls and queue the detail URL of every listed school for the enrichment workers."""
+        distributed = self.configs["distributed"]
+        worker_id = worker_id or default_worker_id()
+        # Any number of workers can run on one host, so each browser gets a free port rather than the default one.
+        self.debugging_port = find_free_port()
+        queue = self._get_task_queue()
+        try:
+            while True:
+                task = queue.lease(DISCOVER_QUEUE, worker_id, distributed["visibility_timeout"])
+                if task is None:
+                    break
+                self.execution_date = task.payload["execution_date"]
+                logging.info(f"Worker {worker_id} discovering crawl {self.execution_date}.")
+                try:
+                    self.execute_before(self.configs)
+                    paginator = Paginator(self, self.configs)
+                    paginator.select_results_per_page()
+                    for page, page_urls in paginator.iter_pages(self.configs["navigation"]["pages_total"]):
+                        added = queue.enqueue(ENRICH_QUEUE, [
+                            (f"{self.execution_date}:{self.checkpoint.key(url)}", {"url": url, "execution_date": self.execution_date})
+                            for url in page_urls
+                        ])
+                        logging.info(f"Listing page {page}: {added} URLs queued.")
+                        if not queue.extend(task, distributed["visibility_timeout"]):
+                            raise Exception("Lease of the discovery task was lost.")
+                    queue.ack(task)
+                except Exception as e:
+                    self._release_task(queue, task, e)
+        finally:
+            self.quit_browser()
+            queue.close()
+            self._export_metrics()
+
+    def run_enrich_worker(self, worker_id=None):
+        """
+        Lease detail URLs until the crawls are drained, writing their records to the shared storage in batches.
+
+        Tasks are only acknowledged once their batch is saved, so the records of a dead worker are scraped again elsewhere.
+        """
+        distributed = self.configs["distributed"]
+        worker_id = worker_id or default_worker_id()
+        self.debugging_port = find_free_port()
+        queue = self._get_task_queue()
+        batch = []
+        try:
+            while True:
+                task = queue.lease(ENRICH_QUEUE, worker_id, distributed["visibility_timeout"])
+                if task is None:
+                    self._save_enriched_batch(queue, batch, self.execution_date)
+                    if not queue.has_work([DISCOVER_QUEUE, ENRICH_QUEUE]):
+                        break
+                    time.sleep(distributed["poll_interval"])
+                    continue
+
+                url = task.payload["url"]
+                if batch and task.payload["execution_date"] != self.execution_date:
+                    self._save_enriched_batch(queue, batch, self.execution_date)
+                self.execution_date = task.payload["execution_date"]
+                try:
+                    with self.metrics.trace(url), self.metrics.time("detail_page"):
+                        fields = self.visit_page(self._fetch_fields, url)
+                    batch.append((task, self._build_raw_record(url, fields)))
+                except Exception as e:
+                    self._release_task(queue, task, e)
+                if len(batch) >= distributed["batch_size"]:
+                    self._save_enriched_batch(queue, batch, self.execution_date)
+            print(f"Worker {worker_id} done, {len(self.failed_urls)} URLs failed.")
+        finally:
+            self._close_providers()
+            queue.close()
+            self._export_metrics()
+
+    def _save_enriched_batch(self, queue, batch, execution_date):
+        """Save a batch of records of the same crawl, then acknowledge their tasks."""
+        if not batch:
+            return
+        storage = self.configs["storage"]
+        records = RecordBatch(execution_date, [record for _, record in batch])
+        processed_df = self.post_process(records.to_frame(self.configs["extraction"]["fields"]))
+        self.save_data(processed_df, storage["filename"], storage["headers"] + ["execution_date"], backend=self.configs["distributed"]["storage_backend"])
+        for task, _ in batch:
+            queue.ack(task)
+        batch.clear()
+
+    def _release_task(self, queue, task, error):
+        """Requeue a failed task after a crash or a transient error, or mark it as dead."""
+        if isinstance(error, BrowserCrashedError):
+            logging.warning(f"Requeued task '{task.key}' after a browser crash.")
+            self.metrics.increment("retries_total", reason="crash")
+            queue.nack(task, str(error))
+        elif self.retry_policy.should_retry(error, task.attempts):
+            delay = self.retry_policy.delay(task.attempts)
+            self.metrics.increment("retries_total", reason="transient")
+            logging.warning(f"Retrying task '{task.key}' in {delay:.1f}s (attempt {task.attempts + 1}).")
+            queue.nack(task, str(error), delay)
+        else:
+            print(f"Unable to process task '{task.key}': {error}")
+            self.metrics.increment("failures_total")
+            if "url" in task.payload:
+                self.failed_urls.append(task.payload["url"])
+            queue.fail(task, str(error))
+
+    def _get_succeeded_ids(self):
+        """School IDs already scraped successfully, from the checkpoint and the data file."""
+        storage = self.configs["storage"]
+        succeeded_ids = {self.checkpoint.key(url) for url in self.checkpoint.urls_with_status(DONE)}
+        data_df = self.read_data(storage["filename"], storage["headers"], columns=["School ID"], backend=storage["backend"])
+        if "School ID" in data_df.columns:
+            succeeded_ids.update(data_df["School ID"].dropna().astype(str))
+        return succeeded_ids
+
+    def execute_main(self):
+        try:
+            self._access_urls(self._iter_pending_pages())
+        except Exception as e:
+            raise Exception("Failed to execute main scraping logic.") from e
+        finally:
+            self._close_providers()
+
+    def _close_providers(self):
+        self.quit_browser()
+        if self.http_provider is not None:
+            self.http_provider.close()
+        if self.capture_store is not None:
+            self.capture_store.close()
+
+    def _access_urls(self, pages):
+        """Scrape the URLs of each page of URLs, with the shared browser pool, the asyncio orchestrator, the worker pool or sequentially."""
+        if self.browser_pool is not None:
+            self._access_urls_with_pool(pages, self._get_site_pool())
+            return
+        if self.configs["concurrency"]["orchestrator"] == "asyncio":
+            self._access_urls_with_orchestrator(pages)
+            return
+        if self.configs["concurrency"]["workers"] > 1:
+            self._access_urls_with_pool(pages)
+            return
+
+        # The listing and the detail pages share the scraper's browser here, so the whole listing is read first:
+        # visiting a detail page would leave the browser away from the listing's pagination.
+        self._process_urls([url for page_urls in pages for url in page_urls])
+
+    def _process_urls(self, urls):
+        """Process URLs in order, then the transient failures requeued with a backoff delay."""
+        retries = []
+        for url in urls:
+            self._process_url(url, retries=retries)
+        while retries:
+            ready_at, attempt, url = heapq.heappop(retries)
+            with self.metrics.time("backoff_sleep"):
+                time.sleep(max(0, ready_at - time.monotonic()))
+            self._process_url(url, attempt, retries)
+
+    def _iter_pending_pages(self):
+        """Yield the URLs still to be scraped: first those pending from a resumed run, then each newly enumerated listing page."""
+        yield from batched(self.checkpoint.pending_urls(), self.configs["concurrency"]["max_pending_urls"])
+
+        pages_total = self.checkpoint.get_meta("pages_total")
+        enumerated_pages = self.checkpoint.enumerated_pages()
+        if pages_total and len(enumerated_pages) >= int(pages_total):
+            logging.info("Every listing page was already enumerated.")
+            self.listing_complete = not self.configs["navigation"]["pages_total"]
+            return
+
+        paginator = Paginator(self, self.configs)
+        paginator.select_results_per_page()
+        for page, page_urls in paginator.iter_pages(self.configs["navigation"]["pages_total"], track_listing=self.incremental):
+            self.checkpoint.set_meta("pages_total", paginator.pages_total)
+            if page in enumerated_pages:
+                continue
+            pending_urls = self.checkpoint.mark_page_enumerated(page, page_urls)
+            if self.incremental:
+                self.fingerprints.mark_seen([self.checkpoint.key(url) for url in page_urls], self.execution_date)
+                pending_urls = self._skip_unchanged_listings(pending_urls, paginator.listing_texts)
+            yield pending_urls
+
+        self.listing_complete = paginator.pages_total is not None and not self.configs["navigation"]["pages_total"]
+
+    def _skip_unchanged_listings(self, urls, listing_texts):
+        """Drop the schools whose listing row is identical to the previous run, when configured to trust the listing."""
+        changed_urls = []
+        unchanged_urls = []
+        for url in urls:
+            listing_hash = fingerprint(listing_texts.get(url, ""))
+            self._listing_hashes[url] = listing_hash
+            previous = self.fingerprints.get(self.checkpoint.key(url))
+            if self.configs["incremental"]["skip_unchanged_listing"] and previous is not None and previous["listing_hash"] == listing_hash:
+                unchanged_urls.append(url)
+            else:
+                changed_urls.append(url)
+        self.checkpoint.mark_done(unchanged_urls)
+        return changed_urls
+
+    def _is_unmodified(self, url):
+        """Use the ETag / Last-Modified validators of the school's JSON endpoint, when there is one, to skip unchanged schools."""
+        api_url = self.configs["extraction"]["http"]["api_url"]
+        if self.http_provider is None or not api_url:
+            return False
+        previous = self.fingerprints.get(self.checkpoint.key(url))
+        etag = previous["etag"] if previous is not None else None
+        last_modified = previous["last_modified"] if previous is not None else None
+        try:
+            modified, etag, last_modified = self.http_provider.check_modified(self.http_provider.format_api_url(url, api_url), etag, last_modified)
+        except Exception:
+            return False
+        with self._fingerprints_lock:
+            self._validators[url] = {"etag": etag, "last_modified": last_modified}
+        return not modified
+
+    def _write_record(self, url, record):
+        """Write a scraped record, or in incremental mode only the records whose content changed."""
+        if not self.incremental:
+            self.pipeline.write(record, tag=url)
+            return
+
+        content_hash = fingerprint(record.to_dict(self.configs["extraction"]["fields"]))
+        previous = self.fingerprints.get(record.key)
+        values = {"url": url, "content_hash": content_hash, "last_seen": self.execution_date, "updated_at": self.execution_date}
+        if url in self._listing_hashes:
+            values["listing_hash"] = self._listing_hashes[url]
+        with self._fingerprints_lock:
+            values.update(self._validators.pop(url, {}))
+        if previous is not None and previous["content_hash"] == content_hash:
+            self.fingerprints.upsert(record.key, **values)
+            self.checkpoint.mark_done([url])
+            return
+
+        with self._fingerprints_lock:
+            self._unflushed_fingerprints[url] = values
+        self.pipeline.write(record._replace(change_type="upsert"), tag=url)
+
+    def _record_deletions(self):
+        """Record the schools missing from a complete listing as deletions."""
+        if not self.listing_complete:
+            logging.info("Listing not fully enumerated, skipping deletion detection.")
+            return
+        deleted_ids = self.fingerprints.unseen_since(self.execution_date)
+        no_values = (None,) * len(self.configs["extraction"]["fields"])
+        for school_id in deleted_ids:
+            self.pipeline.write(RawRecord(school_id, None, no_values, "delete"))
+        self.pipeline.flush()
+        self.fingerprints.delete(deleted_ids)
+        logging.info(f"{len(deleted_ids)} schools recorded as deleted.")
+
+    def _process_url(self, url, attempt=1, retries=None):
+        try:
+            self._scrape_url(url)
+        except BrowserCrashedError as e:
+            self._crash_requeues[url] = self._crash_requeues.get(url, 0) + 1
+            if retries is not None and self._crash_requeues[url] <= self.configs["lifecycle"]["max_crash_requeues"]:
+                logging.warning(f"Requeued URL '{url}' after a browser crash.")
+                self.metrics.increment("retries_total", reason="crash")
+                heapq.heappush(retries, (time.monotonic(), attempt, url))
+                return
+            self._record_failure(url, e)
+        except Exception as e:
+            if retries is not None and self.retry_policy.should_retry(e, attempt):
+                delay = self.retry_policy.delay(attempt)
+                logging.warning(f"Retrying URL '{url}' in {delay:.1f}s (attempt {attempt + 1}).")
+                self.metrics.increment("retries_total", reason="transient")
+                heapq.heappush(retries, (time.monotonic() + delay, attempt + 1, url))
+                return
+            self._record_failure(url, e)
+
+    def _scrape_url(self, url):
+        if self.incremental and self._is_unmodified(url):
+            self.checkpoint.mark_done([url])
+            return
+        with self.metrics.trace(url), self.metrics.time("detail_page"):
+            self.visit_page(self.access_url_and_save_content, url)
+
+    def _record_failure(self, url, error):
+        print(f"Unable to access page: {error}")
+        self.metrics.increment("failures_total")
+        self.failed_urls.append(url)
+        self.checkpoint.mark_failed(url, str(error))
+
+    def _access_urls_with_pool(self, pages, pool=None):
+        """Stream the URLs of each listing page to the pool (a pool of its own by default) while the next pages are still being read."""
+        pool = pool or BrowserPool(
+            self.configs["concurrency"]["workers"],
+            self.get_session_manager(),
+            base_port=self.configs["concurrency"]["base_port"],
+            max_crash_requeues=self.configs["lifecycle"]["max_crash_requeues"],
+            metrics=self.metrics
+        )
+        pool.start(self._access_url_with_session, retry_policy=self.retry_policy, on_failure=self._record_failure)
+        try:
+            for page_urls in pages:
+                for url in page_urls:
+                    # Backpressure: the listing only moves ahead of the workers by a bounded number of URLs.
+                    pool.wait_for_capacity(self.configs["concurrency"]["max_pending_urls"])
+                    pool.submit(url)
+        finally:
+            pool.join()
+
+    def _get_site_pool(self):
+        """Pool of the site in the shared browser pool, keeping the per-host rate limit of an 'asyncio' site."""
+        if self.configs["concurrency"]["orchestrator"] != "asyncio":
+            return self.browser_pool.site(self.name, metrics=self.metrics)
+        logging.warning(
+            f"Site '{self.name}' shares its browsers: its rate limit and 'max_in_flight' apply, "
+            f"but the concurrency does not adapt to latency and errors as with the asyncio orchestrator."
+        )
+        return self.browser_pool.site(self.name, metrics=self.metrics, rate_limit=self.configs["rate_limit"])
+
+    def _access_urls_with_orchestrator(self, pages):
+        """Read the listing pages and scrape their URLs concurrently, within the configured rate limits."""
+        orchestrator = CrawlOrchestrator(
+            self.configs["concurrency"]["workers"],
+            self.get_session_manager(),
+            base_port=self.configs["concurrency"]["base_port"],
+            rate_limit=self.configs["rate_limit"],
+            max_crash_requeues=self.configs["lifecycle"]["max_crash_requeues"],
+            max_pending=self.configs["concurrency"]["max_pending_urls"],
+            metrics=self.metrics
+        )
+        orchestrator.run(pages, self._access_url_with_session, listing_url=self.configs["link"]["path"], retry_policy=self.retry_policy, on_failure=self._record_failure)
+
+    def _access_url_with_session(self, session, url):
+        self.bind_browser(session)
+        self._scrape_url(url)
+
+    def access_url_and_save_content(self, url):
+        try:
+            fields = self._fetch_fields(url)
+            self._write_record(url, self._build_raw_record(url, fields))
+        except Exception as e:
+            raise Exception(f"Failed to access URL: {url}. Error: {e}") from e
+
+    def _build_raw_record(self, url, fields):
+        """Keep the raw field text of a page as a compact record; it is parsed in batch by 'post_process'."""
+        return RawRecord(self.checkpoint.key(url), url, tuple(fields.get(field) for field in self.configs["extraction"]["fields"]))
+
+    def _fetch_fields(self, url):
+        """Fetch the raw detail fields, through HTTP when configured, falling back to the browser."""
+        if self.http_provider is not None:
+            try:
+                return self._fetch_fields_with_http(url)
+            except Exception as e:
+                logging.warning(f"HTTP extraction failed for URL '{url}', falling back to the browser: {e}")
+        return self._fetch_fields_with_browser(url)
+
+    def _fetch_fields_with_http(self, url):
+        extraction = self.configs["extraction"]
+        fields, html = self.http_provider.extract_fields_and_html(
+            url,
+            self.detail_selectors,
+            attributes=extraction["attributes"],
+            api_url=extraction["http"]["api_url"],
+            api_fields=extraction["http"]["fields"]
+        )
+        self._capture(url, fields, html if self.configs["capture"]["html"] else None)
+        return fields
+
+    def _fetch_fields_with_browser(self, url):
+        self.navigate_to_url(url)
+        fields = self.extract_configured_fields(self.configs)
+        if self.capture_store is not None:
+            self._capture(url, fields, self.browser.page_source if self.configs["capture"]["html"] else None)
+        # Missing optional fields are kept as None and flagged by 'post_process'.
+        return fields
+
+    def _capture(self, url, fields, html=None):
+        if self.capture_store is None:
+            return
+        try:
+            self.capture_store.save(url, self.execution_date, fields, html)
+        except Exception as e:
+            logging.warning(f"Unable to capture URL '{url}': {e}")
+
+    def execute_after(self):
+        """Collect the URLs that failed for good. Records are post-processed batch by batch while the pages are scraped."""
+        try:
+            self.failed_urls_df = self.transform_to_df(self.failed_urls, self.configs["storage"]["failed_headers"], add_execution_date=True)
+        except Exception as e:
+            raise Exception("Failed to execute post-scraping logic.") from e
+
+    def transform_to_df(self, data, columns, add_execution_date=False):
+        try:
+            df = pd.DataFrame(data, columns=columns)
+            if add_execution_date:
+                df["execution_date"] = self.execution_date
+            return df
+        except Exception as e:
+            raise Exception("Failed to transform data into DataFrame.") from e
+
+    def post_process(self, raw_df):
+        """
+        Map the raw fields of a batch of records to the output columns: fields are renamed with the optional
+        'consolidation.rename' map, and the columns missing from 'consolidation.columns' are dropped.
+        Deletions recorded by incremental runs are passed through.
+        """
+        try:
+            columns = self.configs["consolidation"]["columns"]
+            extra_columns = [column for column in ("change_type", "execution_date") if column in raw_df.columns]
+            return raw_df.rename(columns=self.configs["consolidation"].get("rename", {})).reindex(columns=columns + extra_columns)
+        except Exception as e:
+            raise Exception("Failed to post-process the scraped data.") from e
+
+    # def capture_screenshot(self, filename="screenshot.png"):
+    #     """Saves a screenshot to the project root folder. Function used for debugging and testing."""
+    #     self.browser.save_screenshot(filename)
+    #     print(f"Screenshot saved as {filename}")
+
+    # def scroll_to_bottom(self):
+    #     """Scroll to the bottom of the page. Used for debugging and testing"""
+    #     try:
+    #         self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    #         logging.info("Scrolled to the bottom of the page.")
+    #     except Exception as e:
+    #         logging.error(f"Failed to scroll to the bottom of the page: {e}")
+    #         raise
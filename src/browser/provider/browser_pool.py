@@ -0,0 +1,138 @@
+import queue
+import logging
+import threading
+from typing import Callable, List, Optional
+from browser.provider.browser_session import BrowserSession, BrowserSessionManager, BrowserCrashedError
+from tools.retry_policy import RetryPolicy
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+_STOP = object()
+
+class BrowserPool:
+    """Pool of browser workers, each with its own managed browser session, pulling URLs from a shared queue."""
+
+    def __init__(self, workers: int, session_manager: BrowserSessionManager, base_port: int = 9223, max_crash_requeues: int = 3, metrics=None):
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: '{workers}'")
+        self.workers = workers
+        self.session_manager = session_manager
+        self.base_port = base_port
+        self.max_crash_requeues = max_crash_requeues
+        self.metrics = metrics
+        self.queue = queue.Queue()
+        self.failed_urls = []
+        self.retry_policy = None
+        self.on_failure = None
+        self._crash_requeues = {}
+        self._lock = threading.Lock()
+        self._capacity = threading.Condition()
+        self._threads = []
+
+    def start(self, handler: Callable[[BrowserSession, str], None], retry_policy: Optional[RetryPolicy] = None,
+              on_failure: Optional[Callable[[str, Exception], None]] = None) -> None:
+        """
+        Start the worker threads.
+
+        :param handler: Called with the worker's browser session and a URL. Raising marks the URL as failed,
+                        except for BrowserCrashedError which requeues it.
+        :param retry_policy: Optional policy requeueing transient failures after a backoff delay.
+        :param on_failure: Optional callback receiving each URL that failed for good, and its error.
+        """
+        self.retry_policy = retry_policy
+        self.on_failure = on_failure
+        for index in range(self.workers):
+            session = self.session_manager.create_session(self.base_port + index, f'worker_{index}')
+            thread = threading.Thread(target=self._run_worker, args=(index, session, handler), name=f"browser-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, url: str, attempt: int = 1) -> None:
+        """Add a URL to the shared queue."""
+        self.queue.put((url, attempt))
+
+    def wait_for_capacity(self, max_pending: int) -> None:
+        """Block until fewer than 'max_pending' URLs, including scheduled retries, are waiting or being processed."""
+        with self._capacity:
+            self._capacity.wait_for(lambda: self.queue.unfinished_tasks < max_pending)
+
+    def join(self) -> List[str]:
+        """Wait until every URL, including scheduled retries, is processed, stop the workers and return the failed URLs."""
+        self.queue.join()
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        return self.failed_urls
+
+    def _run_worker(self, index: int, session: BrowserSession, handler: Callable[[BrowserSession, str], None]) -> None:
+        """Process URLs until the stop signal is received."""
+        try:
+            while True:
+                item = self.queue.get()
+                if item is _STOP:
+                    break
+                url, attempt = item
+                self._process(index, session, handler, url, attempt)
+        finally:
+            session.close()
+
+    def _process(self, index: int, session: BrowserSession, handler: Callable[[BrowserSession, str], None], url: str, attempt: int) -> None:
+        """Run the handler on a URL taken from the queue, requeueing it after a crash or a transient error."""
+        retrying = False
+        try:
+            handler(session, url)
+        except BrowserCrashedError as e:
+            if self._should_requeue_after_crash(url):
+                logging.warning(f"Worker {index} requeued URL '{url}' after a browser crash.")
+                self._count_retry("crash")
+                self.submit(url, attempt)
+            else:
+                self._record_failure(url, e)
+        except Exception as e:
+            if self.retry_policy is not None and self.retry_policy.should_retry(e, attempt):
+                self._schedule_retry(url, attempt)
+                retrying = True
+            else:
+                logging.error(f"Worker {index} failed to process URL '{url}': {e}")
+                self._record_failure(url, e)
+        finally:
+            if not retrying:
+                self._task_done()
+
+    def _task_done(self) -> None:
+        self.queue.task_done()
+        with self._capacity:
+            self._capacity.notify_all()
+
+    def _should_requeue_after_crash(self, url: str) -> bool:
+        with self._lock:
+            self._crash_requeues[url] = self._crash_requeues.get(url, 0) + 1
+            return self._crash_requeues[url] <= self.max_crash_requeues
+
+    def _schedule_retry(self, url: str, attempt: int) -> None:
+        """Requeue a URL after a backoff delay. The original task stays unfinished until then, so 'join' waits for it."""
+        delay = self.retry_policy.delay(attempt)
+        logging.warning(f"Retrying URL '{url}' in {delay:.1f}s (attempt {attempt + 1}).")
+        self._count_retry("transient")
+
+        def requeue():
+            self.submit(url, attempt + 1)
+            self._task_done()
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        timer.start()
+
+    def _count_retry(self, reason: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment("retries_total", reason=reason)
+
+    def _record_failure(self, url: str, error: Exception) -> None:
+        with self._lock:
+            self.failed_urls.append(url)
+        if self.on_failure is not None:
+            try:
+                self.on_failure(url, error)
+            except Exception as e:
+                logging.error(f"Failed to record the failure of URL '{url}': {e}")
@@ -0,0 +1,183 @@
+import os
+import shutil
+import socket
+import logging
+import tempfile
+import threading
+from typing import Optional
+from browser.provider.generic_browser_provider import GenericBrowserProvider
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+class BrowserCrashedError(Exception):
+    """Raised when a page failed because its browser session died. The page should be requeued, not marked failed."""
+
+
+def get_process_tree_rss_mb(pid: int) -> Optional[float]:
+    """Return the resident memory, in MB, of a process and all its descendants. None where /proc is unavailable."""
+    if not os.path.isdir('/proc'):
+        return None
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as file:
+                # The command name may contain spaces, so the parent PID is read after its closing parenthesis.
+                parent = int(file.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f'/proc/{current}/status', 'r') as file:
+                for line in file:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def find_free_port() -> int:
+    """Return a TCP port free on this host, picked by the OS."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class BrowserSession:
+    """
+    Browser owned by a lifecycle manager: launched on first use, health-checked before each page,
+    and recycled after 'max_pages' pages or once its process tree exceeds 'max_rss_mb'.
+
+    With 'remove_profile', the profile directory is temporary and deleted when the session is closed.
+    """
+
+    def __init__(self, debugging_port: int = 9222, profile_dir: str = None, resource_policy: dict = None,
+                 max_pages: int = 0, max_rss_mb: float = 0, rss_check_interval: int = 10, remove_profile: bool = False):
+        self.debugging_port = debugging_port
+        self.profile_dir = profile_dir
+        self.remove_profile = remove_profile
+        self.resource_policy = resource_policy
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.rss_check_interval = rss_check_interval
+        self.provider = None
+        self.pages = 0
+        self.restarts = 0
+        self._lock = threading.Lock()
+
+    @property
+    def browser(self):
+        with self._lock:
+            if self.provider is None:
+                self.provider = GenericBrowserProvider(debugging_port=self.debugging_port, profile_dir=self.profile_dir, resource_policy=self.resource_policy)
+                self.pages = 0
+        return self.provider.browser
+
+    @property
+    def started(self) -> bool:
+        return self.provider is not None
+
+    def is_healthy(self) -> bool:
+        """Check that the browser still answers commands."""
+        if self.provider is None:
+            return True
+        try:
+            self.provider.browser.execute_script("return 1;")
+            return True
+        except Exception as e:
+            logging.warning(f"Browser on port {self.debugging_port} failed its health check: {e}")
+            return False
+
+    def rss_mb(self) -> Optional[float]:
+        """Resident memory of the driver and browser processes, in MB."""
+        if self.provider is None:
+            return 0
+        try:
+            return get_process_tree_rss_mb(self.provider.browser.service.process.pid)
+        except Exception:
+            return None
+
+    def before_page(self) -> None:
+        """Recycle the browser if it crashed or reached its page or memory limits."""
+        if self.provider is None:
+            return
+        if not self.is_healthy():
+            self.restart("failed health check")
+        elif self.max_pages and self.pages >= self.max_pages:
+            self.restart(f"reached {self.pages} pages")
+        elif self.max_rss_mb and self.pages and self.pages % self.rss_check_interval == 0:
+            rss = self.rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                self.restart(f"using {rss:.0f} MB")
+
+    def page_done(self) -> None:
+        self.pages += 1
+
+    def restart(self, reason: str) -> None:
+        logging.info(f"Restarting browser on port {self.debugging_port}: {reason}.")
+        self.quit()
+        self.restarts += 1
+
+    def quit(self) -> None:
+        with self._lock:
+            provider, self.provider = self.provider, None
+        if provider is not None:
+            try:
+                provider.browser.quit()
+            except Exception as e:
+                logging.warning(f"Failed to quit browser on port {self.debugging_port}: {e}")
+
+    def close(self) -> None:
+        """Quit the browser for good, deleting its temporary profile."""
+        self.quit()
+        if self.remove_profile and self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class BrowserSessionManager:
+    """Creates and owns the browser sessions of a scraper, so they can all be recycled and closed together."""
+
+    def __init__(self, resource_policy: dict = None, lifecycle: dict = None, base_dir: str = None):
+        self.resource_policy = resource_policy
+        self.lifecycle = lifecycle or {}
+        self.base_dir = base_dir or os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../'))
+        self.sessions = []
+        self._lock = threading.Lock()
+
+    def create_session(self, debugging_port: int = 9222, profile_name: str = None) -> BrowserSession:
+        """
+        Create a session. Named sessions get a fresh temporary profile, deleted when the session is closed, so no
+        cache is carried over between runs and sessions of concurrent processes never share a profile.
+        """
+        session = BrowserSession(
+            debugging_port=debugging_port,
+            profile_dir=tempfile.mkdtemp(prefix=f'browser-profile-{profile_name}-') if profile_name else None,
+            resource_policy=self.resource_policy,
+            max_pages=self.lifecycle.get("max_pages", 0),
+            max_rss_mb=self.lifecycle.get("max_rss_mb", 0),
+            rss_check_interval=self.lifecycle.get("rss_check_interval", 10),
+            remove_profile=bool(profile_name)
+        )
+        with self._lock:
+            self.sessions.append(session)
+        return session
+
+    def handle_failure(self, session: BrowserSession, error: Exception) -> None:
+        """Replace a crashed browser and raise BrowserCrashedError so the page is requeued; re-raise any other error."""
+        if session.started and not session.is_healthy():
+            session.restart("crashed")
+            raise BrowserCrashedError(f"Browser on port {session.debugging_port} crashed: {error}") from error
+        raise error
+
+    def quit_all(self) -> None:
+        for session in self.sessions:
+            session.close()
@@ -0,0 +1,147 @@
+import time
+import asyncio
+import logging
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+from browser.provider.browser_session import BrowserSession, BrowserSessionManager, BrowserCrashedError
+from tools.rate_limiter import HostRateLimiter, AdaptiveConcurrencyLimiter
+from tools.retry_policy import RetryPolicy, classify_error, TRANSIENT
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+class CrawlOrchestrator:
+    """
+    Asyncio scheduler of the listing and detail tasks of a crawl over a set of browser sessions.
+
+    Blocking WebDriver calls run on executor threads. Every request waits for a token of its host's rate limit,
+    and the number of requests in flight adapts to the observed latency and transient error rate. At most
+    'max_pending' URLs are scheduled at once before the next page of URLs is read.
+    """
+
+    def __init__(self, workers: int, session_manager: BrowserSessionManager, base_port: int = 9223,
+                 rate_limit: Optional[dict] = None, max_crash_requeues: int = 3, max_pending: int = 100, metrics=None):
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: '{workers}'")
+        if max_pending < 1:
+            raise ValueError(f"Invalid number of pending URLs: '{max_pending}'")
+        self.workers = workers
+        self.session_manager = session_manager
+        self.base_port = base_port
+        self.rate_limit = rate_limit or {}
+        self.max_crash_requeues = max_crash_requeues
+        self.max_pending = max_pending
+        self.metrics = metrics
+        self.host_limiter = HostRateLimiter(self.rate_limit.get("requests_per_second", 1), self.rate_limit.get("burst", 1))
+        self.concurrency = None
+        self.failed_urls = []
+        self._crash_requeues = {}
+
+    def run(self, pages: Iterable[List[str]], handler: Callable[[BrowserSession, str], None], listing_url: Optional[str] = None,
+            retry_policy: Optional[RetryPolicy] = None, on_failure: Optional[Callable[[str, Exception], None]] = None) -> List[str]:
+        """
+        Enumerate the pages of URLs and process every URL, then return the URLs that failed for good.
+
+        :param pages: Blocking iterable of URL lists (e.g. listing pages), read on a dedicated thread.
+        :param handler: Called with a browser session and a URL. Raising BrowserCrashedError requeues the URL.
+        :param listing_url: URL of the listing, so reading each page of URLs is rate limited with its host.
+        :param retry_policy: Optional policy retrying transient failures after a backoff delay.
+        :param on_failure: Optional callback receiving each URL that failed for good, and its error.
+        """
+        return asyncio.run(self._run(pages, handler, listing_url, retry_policy, on_failure))
+
+    async def _run(self, pages, handler, listing_url, retry_policy, on_failure) -> List[str]:
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            max_limit=min(self.rate_limit.get("max_in_flight", self.workers), self.workers),
+            min_limit=min(self.rate_limit.get("min_in_flight", 1), self.workers),
+            target_latency=self.rate_limit.get("target_latency", 5),
+            max_error_rate=self.rate_limit.get("max_error_rate", 0.2),
+            window=self.rate_limit.get("window", 20)
+        )
+        sessions = asyncio.Queue()
+        for index in range(self.workers):
+            sessions.put_nowait(self.session_manager.create_session(self.base_port + index, f'worker_{index}'))
+
+        # Listing pages use the scraper's own browser, so they are read on a thread never bound to a worker session.
+        listing_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl-listing")
+        detail_executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crawl-detail")
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        try:
+            iterator = iter(pages)
+            while True:
+                # Backpressure: the next listing page is only read once few enough URLs are waiting to be scraped.
+                while len(tasks) >= self.max_pending:
+                    await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                if listing_url:
+                    await self.host_limiter.acquire(urlparse(listing_url).netloc)
+                page_urls = await loop.run_in_executor(listing_executor, next, iterator, None)
+                if page_urls is None:
+                    break
+                for url in page_urls:
+                    task = asyncio.create_task(self._process_url(url, sessions, detail_executor, handler, retry_policy, on_failure))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        finally:
+            while tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            listing_executor.shutdown(wait=True)
+            detail_executor.shutdown(wait=True)
+            while not sessions.empty():
+                sessions.get_nowait().close()
+        return self.failed_urls
+
+    async def _process_url(self, url, sessions, executor, handler, retry_policy, on_failure) -> None:
+        """Process a URL until it succeeds, is requeued too many times, or fails with a permanent error."""
+        loop = asyncio.get_running_loop()
+        attempt = 1
+        while True:
+            await self.concurrency.acquire()
+            session = await sessions.get()
+            error = None
+            started = time.monotonic()
+            try:
+                await self.host_limiter.acquire(urlparse(url).netloc)
+                started = time.monotonic()
+                await loop.run_in_executor(executor, handler, session, url)
+            except Exception as e:
+                error = e
+            finally:
+                sessions.put_nowait(session)
+                stressed = error is not None and (isinstance(error, BrowserCrashedError) or classify_error(error) == TRANSIENT)
+                await self.concurrency.release(time.monotonic() - started, stressed)
+
+            if error is None:
+                return
+            if isinstance(error, BrowserCrashedError):
+                if self._should_requeue_after_crash(url):
+                    logging.warning(f"Requeued URL '{url}' after a browser crash.")
+                    self._count_retry("crash")
+                    continue
+            elif retry_policy is not None and retry_policy.should_retry(error, attempt):
+                delay = retry_policy.delay(attempt)
+                logging.warning(f"Retrying URL '{url}' in {delay:.1f}s (attempt {attempt + 1}).")
+                self._count_retry("transient")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            else:
+                logging.error(f"Failed to process URL '{url}': {error}")
+            self._record_failure(url, error, on_failure)
+            return
+
+    def _should_requeue_after_crash(self, url: str) -> bool:
+        self._crash_requeues[url] = self._crash_requeues.get(url, 0) + 1
+        return self._crash_requeues[url] <= self.max_crash_requeues
+
+    def _count_retry(self, reason: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment("retries_total", reason=reason)
+
+    def _record_failure(self, url: str, error: Exception, on_failure) -> None:
+        self.failed_urls.append(url)
+        if on_failure is not None:
+            try:
+                on_failure(url, error)
+            except Exception as e:
+                logging.error(f"Failed to record the failure of URL '{url}': {e}")
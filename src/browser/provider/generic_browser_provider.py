@@ -1,4 +1,5 @@
 import os
+import json
 import time
 import logging
 from selenium import webdriver
@@ -7,18 +8,27 @@ from selenium.webdriver.common.keys import Keys
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav"]
+}
+
 class GenericBrowserProvider:
-    def __init__(self):
+    def __init__(self, debugging_port: int = 9222, profile_dir: str = None, resource_policy: dict = None):
         self.base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../'))
+        self.debugging_port = debugging_port
+        self.profile_dir = profile_dir
+        self.resource_policy = resource_policy or {}
         self.options = webdriver.ChromeOptions()
         self.default_options = [
-            "--remote-debugging-port=9222",
+            f"--remote-debugging-port={self.debugging_port}",
             "--no-sandbox",
             "--disable-gpu",
             "--disable-setuid-sandbox",
             "--disable-web-security",
             "--disable-dev-shm-usage",
-            "--memory-pressure-off",
             "--ignore-certificate-errors",
             "--disable-features=site-per-process",
             "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -26,6 +36,7 @@ class GenericBrowserProvider:
         
         self._configure_browser()
         self.browser = self._get_browser()
+        self._apply_resource_policy()
 
     def _configure_browser(self) -> None:
         """Configure the Chrome browser options and preferences."""
@@ -38,8 +49,58 @@ class GenericBrowserProvider:
         self.options.add_experimental_option("prefs", prefs)
         for option in self.default_options:
             self.options.add_argument(option)
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            self.options.add_argument(f"--user-data-dir={self.profile_dir}")
+        self._configure_resource_policy()
         self._set_headless_mode()
 
+    def _configure_resource_policy(self) -> None:
+        """Restrict requests to the allowed hosts and enable the network log used by 'read_network_stats'."""
+        allow_hosts = self.resource_policy.get("allow_hosts")
+        if allow_hosts:
+            # Every other host fails DNS resolution, which blocks all third-party requests.
+            exclusions = ", ".join(f"EXCLUDE {host}" for host in allow_hosts)
+            self.options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND, {exclusions}")
+        if self.resource_policy.get("report"):
+            self.options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def _apply_resource_policy(self) -> None:
+        """Block the denied URL patterns and resource types through the Chrome DevTools Protocol."""
+        patterns = list(self.resource_policy.get("deny", []))
+        for resource_type in self.resource_policy.get("block_types", []):
+            if resource_type not in RESOURCE_TYPE_PATTERNS:
+                raise ValueError(f"Invalid resource type: '{resource_type}'")
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        if not patterns:
+            return
+        try:
+            self.browser.execute_cdp_cmd("Network.enable", {})
+            self.browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            logging.info(f"Blocking {len(patterns)} URL patterns.")
+        except Exception as e:
+            logging.error(f"Failed to apply the resource policy: {e}")
+            raise
+
+    @staticmethod
+    def read_network_stats(browser) -> dict:
+        """
+        Drain the performance log of a browser started with a reporting resource policy.
+
+        :return: Requests sent, requests blocked (by pattern or by host) and bytes transferred since the last call.
+        """
+        stats = {"requests": 0, "blocked_requests": 0, "bytes_transferred": 0}
+        for entry in browser.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                stats["requests"] += 1
+            elif method == "Network.loadingFinished":
+                stats["bytes_transferred"] += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and (params.get("blockedReason") or params.get("errorText") == "net::ERR_NAME_NOT_RESOLVED"):
+                stats["blocked_requests"] += 1
+        return stats
+
     def _get_browser(self) -> webdriver.Chrome:
         """Initialize and return a Chrome browser instance."""
         try:
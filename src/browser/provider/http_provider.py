@@ -0,0 +1,114 @@
+import logging
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse, parse_qsl
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tools.html_parser import extract_fields_from_html
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+class HttpProvider:
+    """Browserless fetch engine backed by a pooled requests.Session."""
+
+    def __init__(self, pool_size: int = 10, timeout: float = 10, retries: int = 2):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": DEFAULT_USER_AGENT})
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Perform a GET request and raise for HTTP error statuses."""
+        try:
+            response = self.session.get(url, timeout=self.timeout, **kwargs)
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            logging.error(f"Failed to fetch URL '{url}': {e}")
+            raise
+
+    def check_modified(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Perform a conditional GET with the validators of a previous response.
+
+        :return: Whether the resource changed (True when the server ignores the validators), and its new ETag and Last-Modified values.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except Exception as e:
+            logging.error(f"Failed to check URL '{url}' for changes: {e}")
+            raise
+        if response.status_code == 304:
+            return False, etag, last_modified
+        response.raise_for_status()
+        return True, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    def format_api_url(self, url: str, api_url: str) -> str:
+        """Format a JSON endpoint template with the query parameters of a detail URL."""
+        return api_url.format(**dict(parse_qsl(urlparse(url).query)))
+
+    def extract_fields(self, url: str, selectors: Dict[str, str], attributes: Optional[Dict[str, str]] = None,
+                       api_url: str = "", api_fields: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Extract the detail fields of a page without a browser.
+
+        When 'api_url' is configured, the fields are read from the JSON payload found at that URL,
+        formatted with the query parameters of 'url' (e.g. '{id}'). Otherwise the static HTML of 'url'
+        is parsed with the same CSS selectors used by the browser.
+
+        :param url: The detail page URL.
+        :param selectors: Field name to CSS selector map.
+        :param attributes: Field name to attribute map, for fields read from an attribute instead of the text.
+        :param api_url: Optional JSON endpoint template.
+        :param api_fields: Field name to dotted JSON path map, used with 'api_url'.
+        :return: Field name to value map. Raises ValueError if any field is missing.
+        """
+        return self.extract_fields_and_html(url, selectors, attributes, api_url, api_fields)[0]
+
+    def extract_fields_and_html(self, url: str, selectors: Dict[str, str], attributes: Optional[Dict[str, str]] = None,
+                                api_url: str = "", api_fields: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, str], Optional[str]]:
+        """Like 'extract_fields', also returning the HTML the fields were parsed from (None when read from 'api_url')."""
+        html = None
+        if api_url:
+            fields = self._extract_from_json(url, api_url, api_fields or {})
+        else:
+            html = self.get(url).text
+            fields = extract_fields_from_html(html, selectors, attributes or {})
+
+        missing = [field for field, value in fields.items() if value is None]
+        if missing:
+            raise ValueError(f"Missing fields {missing} for URL '{url}'")
+        return fields, html
+
+    def _extract_from_json(self, url: str, api_url: str, api_fields: Dict[str, str]) -> Dict[str, Optional[str]]:
+        payload = self.get(self.format_api_url(url, api_url)).json()
+        return {field: self._resolve_path(payload, path) for field, path in api_fields.items()}
+
+    @staticmethod
+    def _resolve_path(payload, path: str) -> Optional[str]:
+        """Resolve a dotted path (e.g. 'school.address.0') inside a JSON payload."""
+        value = payload
+        for key in path.split('.'):
+            if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+                value = value[int(key)]
+            elif isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                return None
+        return None if value is None else str(value)
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,162 @@
+import queue
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlparse
+from typing import Callable, List, Optional
+from browser.provider.browser_pool import BrowserPool
+from browser.provider.browser_session import BrowserSession, BrowserSessionManager
+from tools.rate_limiter import HostRateLimiter
+from tools.retry_policy import RetryPolicy
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+class SharedBrowserPool:
+    """
+    Browser workers shared by the scrapers of several sites.
+
+    Each site submits its URLs to a queue of its own, through the BrowserPool interface returned by 'site'.
+    An idle worker takes the next URL from the sites in turn (round robin), so a site with a long backlog
+    never starves the others of browsers. A site given a rate limit is skipped while its host has no token
+    left or 'max_in_flight' of its URLs are being processed, without holding a worker for it.
+    """
+
+    def __init__(self, workers: int, session_manager: BrowserSessionManager, base_port: int = 9223, max_crash_requeues: int = 3):
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: '{workers}'")
+        self.workers = workers
+        self.session_manager = session_manager
+        self.base_port = base_port
+        self.max_crash_requeues = max_crash_requeues
+        self._sites = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads = []
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            session = self.session_manager.create_session(self.base_port + index, f'worker_{index}')
+            thread = threading.Thread(target=self._run_worker, args=(index, session), name=f"shared-browser-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def site(self, name: str, metrics=None, rate_limit: Optional[dict] = None) -> 'SiteBrowserPool':
+        """
+        Return the pool of a site: a BrowserPool whose URLs are processed by the shared workers.
+
+        :param rate_limit: Optional 'rate_limit' section of the site's config. Its per-host token bucket
+                           ('requests_per_second', 'burst') and 'max_in_flight' apply to the site's URLs.
+        """
+        return SiteBrowserPool(self, name, metrics, rate_limit)
+
+    def close(self) -> None:
+        """Stop the workers once they are idle, and quit their browsers."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _register(self, site: 'SiteBrowserPool') -> None:
+        with self._condition:
+            self._sites.append(site)
+            self._condition.notify_all()
+
+    def _unregister(self, site: 'SiteBrowserPool') -> None:
+        with self._condition:
+            self._sites.remove(site)
+
+    def _finish(self, site: 'SiteBrowserPool') -> None:
+        with self._condition:
+            site.in_flight -= 1
+            self._condition.notify()
+
+    def _notify(self) -> None:
+        with self._condition:
+            self._condition.notify()
+
+    def _next_task(self):
+        """Wait for the next URL, taking one from each site with queued URLs in turn. Return None once closed."""
+        with self._condition:
+            while True:
+                timeout = None
+                for _ in range(len(self._sites)):
+                    site = self._sites[0]
+                    self._sites.rotate(-1)
+                    task, wait = site._take()
+                    if task is not None:
+                        return (site,) + task
+                    if wait:
+                        timeout = wait if timeout is None else min(timeout, wait)
+                if self._closed:
+                    return None
+                # Sites waiting for a token of their rate limit are checked again once the earliest token is due.
+                self._condition.wait(timeout)
+
+    def _run_worker(self, index: int, session: BrowserSession) -> None:
+        try:
+            while True:
+                task = self._next_task()
+                if task is None:
+                    break
+                site, url, attempt = task
+                try:
+                    site._process(index, session, site.handler, url, attempt)
+                finally:
+                    self._finish(site)
+        finally:
+            session.close()
+
+
+class SiteBrowserPool(BrowserPool):
+    """The URLs of one site in a SharedBrowserPool, with the retry and failure handling of a BrowserPool but no browsers of its own."""
+
+    def __init__(self, shared: SharedBrowserPool, name: str, metrics=None, rate_limit: Optional[dict] = None):
+        super().__init__(shared.workers, shared.session_manager, max_crash_requeues=shared.max_crash_requeues, metrics=metrics)
+        self.shared = shared
+        self.name = name
+        self.handler = None
+        self.host_limiter = HostRateLimiter(rate_limit.get("requests_per_second", 1), rate_limit.get("burst", 1)) if rate_limit else None
+        self.max_in_flight = rate_limit.get("max_in_flight", shared.workers) if rate_limit else shared.workers
+        self.in_flight = 0
+        self._held = None
+
+    def _take(self):
+        """
+        Take the next URL of the site, as a (url, attempt) task, if it may be processed now. Return the task, or None
+        and the seconds until the host of the next URL has a token. Called with the shared pool's condition held.
+        """
+        if self.in_flight >= self.max_in_flight:
+            return None, None
+        task = self._held
+        if task is None:
+            try:
+                task = self.queue.get_nowait()
+            except queue.Empty:
+                return None, None
+        if self.host_limiter is not None:
+            wait = self.host_limiter.try_acquire(urlparse(task[0]).netloc)
+            if wait:
+                # The URL keeps its place, ahead of the site's queue, until its host has a token.
+                self._held = task
+                return None, wait
+        self._held = None
+        self.in_flight += 1
+        return task, None
+
+    def start(self, handler: Callable[[BrowserSession, str], None], retry_policy: Optional[RetryPolicy] = None,
+              on_failure: Optional[Callable[[str, Exception], None]] = None) -> None:
+        self.handler = handler
+        self.retry_policy = retry_policy
+        self.on_failure = on_failure
+        self.shared._register(self)
+
+    def submit(self, url: str, attempt: int = 1) -> None:
+        super().submit(url, attempt)
+        self.shared._notify()
+
+    def join(self) -> List[str]:
+        """Wait until every URL of the site, including scheduled retries, is processed, and return the failed URLs."""
+        self.queue.join()
+        self.shared._unregister(self)
+        return self.failed_urls
@@ -1,8 +1,12 @@
 import os
 import logging
+import threading
 from abc import ABC, abstractmethod
 from browser.provider.generic_browser_provider import GenericBrowserProvider
-from tools.csv_handler import CsvHandler
+from browser.provider.browser_session import BrowserSession, BrowserSessionManager
+from tools.csv_handler import CsvStreamWriter
+from tools.storage_backend import get_storage_backend
+from tools.metrics import MetricsRegistry, instrumented
 from browser.provider.actions.dict import action_dict
 import pandas as pd
 from selenium.webdriver.common.by import By
@@ -13,11 +17,94 @@ from selenium.webdriver.common.keys import Keys
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+EXTRACT_FIELDS_SCRIPT = """
+const [by, selectors, attributes] = arguments;
+const find = (selector) => by === 'xpath'
+    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(selector);
+const fields = {};
+for (const [field, selector] of Object.entries(selectors)) {
+    const element = find(selector);
+    if (!element) {
+        fields[field] = null;
+    } else if (field in attributes) {
+        const property = element[attributes[field]];
+        fields[field] = typeof property === 'string' ? property : element.getAttribute(attributes[field]);
+    } else {
+        fields[field] = element.innerText.trim();
+    }
+}
+return fields;
+"""
+
+ELEMENTS_ATTRIBUTE_SCRIPT = """
+const [selector, attribute] = arguments;
+return Array.from(document.querySelectorAll(selector), (element) => {
+    const property = element[attribute];
+    return typeof property === 'string' ? property : element.getAttribute(attribute);
+});
+"""
+
 class AbstractScraper(ABC):
     def __init__(self):
-        self.browser_provider = GenericBrowserProvider()
-        self.browser = self.browser_provider.browser
+        self.session_manager = None
+        self.browser_session = None
+        self.resource_policy = None
+        self.lifecycle = None
+        self.column_types = {}
+        self.indexed_columns = []
+        self.detail_selectors = None
+        self.debugging_port = 9222
+        self.metrics = MetricsRegistry()
+        self.network_totals = {"pages": 0, "requests": 0, "blocked_requests": 0, "bytes_transferred": 0}
         self.base_dir = self._get_base_dir()
+        self._thread_state = threading.local()
+        self._lock = threading.Lock()
+
+    def get_session_manager(self) -> BrowserSessionManager:
+        """Return the manager owning every browser session of the scraper, created on first use."""
+        with self._lock:
+            if self.session_manager is None:
+                self.session_manager = BrowserSessionManager(resource_policy=self.resource_policy, lifecycle=self.lifecycle, base_dir=self.base_dir)
+                self.browser_session = self.session_manager.create_session(self.debugging_port, 'main')
+        return self.session_manager
+
+    @property
+    def current_session(self) -> BrowserSession:
+        """Browser session bound to the current thread, falling back to the scraper's own session."""
+        session = getattr(self._thread_state, 'session', None)
+        if session is not None:
+            return session
+        self.get_session_manager()
+        return self.browser_session
+
+    @property
+    def browser(self):
+        """Browser of the current session, launched on first use."""
+        return self.current_session.browser
+
+    def quit_browser(self) -> None:
+        """Quit every browser session of the scraper."""
+        if self.session_manager is not None:
+            self.session_manager.quit_all()
+
+    def visit_page(self, handler, *args):
+        """
+        Run a page handler inside the lifecycle of the current session: the browser is health-checked and
+        recycled before the page, and a crash is reported as BrowserCrashedError so the page can be requeued.
+        """
+        session = self.current_session
+        session.before_page()
+        try:
+            result = handler(*args)
+        except Exception as e:
+            self.session_manager.handle_failure(session, e)
+        session.page_done()
+        return result
+
+    def bind_browser(self, session) -> None:
+        """Bind a browser session (any object exposing 'browser') to the current thread so worker threads can reuse the scraper helpers."""
+        self._thread_state.session = session
 
     @staticmethod
     def _get_base_dir() -> str:
@@ -81,26 +168,50 @@ class AbstractScraper(ABC):
             logging.error(f"Error reading configuration file '{config_path}': {e}")
             raise
 
-    def save_data(self, data: list, filename: str, headers: list) -> None:
-        """Save data to a CSV file."""
+    def get_storage(self, filename: str, headers: list, backend: str = "csv"):
+        """Return the storage backend ('csv', 'parquet' or 'sqlite') of a file, typed with the scraper's 'column_types'."""
+        return get_storage_backend(backend, filename, headers, column_types=self.column_types, indexed_columns=self.indexed_columns)
+
+    @instrumented("save_data")
+    def save_data(self, data: list, filename: str, headers: list, backend: str = "csv") -> None:
+        """Save data to a CSV file, or to the given storage backend."""
         try:
-            self.storage = CsvHandler(filename, headers)
-            self.storage.save_data(data)
-            logging.info(f"Data successfully saved to '{filename}'.csv.")
+            self.storage = self.get_storage(filename, headers, backend)
+            try:
+                self.storage.save_data(data)
+            finally:
+                if hasattr(self.storage, "close"):
+                    self.storage.close()
+            logging.info(f"Data successfully saved to '{filename}' ({backend}).")
         except Exception as e:
             logging.error(f"Unable to save data to '{filename}': {e}")
             raise
 
-    def read_data(self, filename: str, headers: list) -> pd.DataFrame:
-        """Read data from a CSV file."""
+    def open_data_writer(self, filename: str, headers: list, batch_size: int = 50, on_flush=None) -> CsvStreamWriter:
+        """Open an append-only writer that streams rows to a CSV file in batches."""
         try:
-            self.storage = CsvHandler(filename, headers)
-            df = self.storage.read_data()
+            return CsvStreamWriter(filename, headers, batch_size=batch_size, on_flush=on_flush, metrics=self.metrics)
+        except Exception as e:
+            logging.error(f"Unable to open '{filename}'.csv for writing: {e}")
+            raise
+
+    @instrumented("read_data")
+    def read_data(self, filename: str, headers: list, where: dict = None, columns: list = None, backend: str = "csv") -> pd.DataFrame:
+        """
+        Read data from a CSV file, or from the given storage backend.
+
+        :param where: Only read the rows whose columns equal these values.
+        :param columns: Only read these columns.
+        """
+        try:
+            self.storage = self.get_storage(filename, headers, backend)
+            df = self.storage.read_data(where=where, columns=columns)
             return df
         except Exception as e:
             logging.error(f"Data successfully read from '{filename}'.csv.")
             raise
 
+    @instrumented("wait_and_click")
     def wait_and_click(self, by: str, identifier: str, timeout: int = 10):
         """
         Wait for an element to be clickable and click it.
@@ -122,6 +233,7 @@ class AbstractScraper(ABC):
             logging.error(f"Failed to click element with {by}='{identifier}': {e}")
             raise
 
+    @instrumented("wait_for_element")
     def wait_for_element(self, by: str, identifier: str, timeout: int = 10) -> None:
         """
         Wait for an element to be present in the DOM.
@@ -142,6 +254,7 @@ class AbstractScraper(ABC):
             logging.error(f"Failed to wait for element with {by}='{identifier}': {e}")
             raise
 
+    @instrumented("element_read")
     def get_element_attribute(self, by: str, identifier: str, attribute: str) -> str:
         """
         Get an attribute value of an element identified by a selector, using a string for the By identifier.
@@ -164,6 +277,87 @@ class AbstractScraper(ABC):
             logging.error(f"Failed to get attribute '{attribute}' from element with {by}='{identifier}': {e}")
             raise
 
+    @instrumented("extract_fields")
+    def extract_fields(self, selectors: dict, attributes: dict = None, by: str = "css_selector", wait_for: list = None, timeout: int = 10) -> dict:
+        """
+        Extract several fields with a single injected script.
+
+        :param selectors: Field name to selector map (e.g. the 'table' section of a config).
+        :param attributes: Field name to attribute map, for fields read from an attribute instead of the text.
+        :param by: The method to locate the elements ("css_selector" or "xpath").
+        :param wait_for: Optional required fields, polled with the same script until they are all present.
+        :param timeout: The maximum time to wait for the 'wait_for' fields, after which TimeoutException is raised.
+        :return: Field name to value map. Missing fields other than 'wait_for' are reported as None instead of raising.
+        """
+        if by not in ("css_selector", "xpath"):
+            raise ValueError(f"Invalid By selector: '{by}'")
+        arguments = (by, selectors, attributes or {})
+
+        try:
+            if wait_for:
+                fields = WebDriverWait(self.browser, timeout, poll_frequency=0.1).until(
+                    lambda browser: self._fields_if_present(browser.execute_script(EXTRACT_FIELDS_SCRIPT, *arguments), wait_for)
+                )
+            else:
+                fields = self.browser.execute_script(EXTRACT_FIELDS_SCRIPT, *arguments)
+        except Exception as e:
+            logging.error(f"Failed to extract fields {list(selectors)}: {e}")
+            raise
+
+        missing = [field for field, value in fields.items() if value is None]
+        if missing:
+            logging.warning(f"Fields not found on page: {missing}")
+        return fields
+
+    @staticmethod
+    def _fields_if_present(fields: dict, wait_for: list):
+        return fields if all(fields.get(field) for field in wait_for) else False
+
+    def extract_configured_fields(self, configs: dict) -> dict:
+        """
+        Extract the detail fields declared in the 'extraction' section of a scraper config. Only the first field,
+        which shows the page is loaded, is waited for; the optional fields are read in the same pass.
+        """
+        extraction = configs["extraction"]
+        selectors = self.detail_selectors or {field: configs["table"][field] for field in extraction["fields"]}
+        return self.extract_fields(
+            selectors,
+            attributes=extraction["attributes"],
+            wait_for=extraction["fields"][:1],
+            timeout=configs["navigation"]["load_timeout"]
+        )
+
+    @instrumented("element_read")
+    def get_elements_attribute(self, identifier: str, attribute: str) -> list:
+        """
+        Get an attribute value of every element matching a CSS selector, in a single query.
+
+        :param identifier: The CSS selector of the elements.
+        :param attribute: The attribute to retrieve (e.g., "href").
+        :return: The values of the attribute, in document order.
+        """
+        try:
+            return self.browser.execute_script(ELEMENTS_ATTRIBUTE_SCRIPT, identifier, attribute)
+        except Exception as e:
+            logging.error(f"Failed to get attribute '{attribute}' from elements with css_selector='{identifier}': {e}")
+            raise
+
+    @instrumented("wait_until")
+    def wait_until(self, condition, timeout: int = 10, description: str = "condition"):
+        """
+        Wait until a condition, called with the browser, returns a truthy value.
+
+        :param condition: Callable receiving the browser.
+        :param timeout: The maximum time to wait.
+        :param description: Description of the condition, used in the error message.
+        :return: The value returned by the condition.
+        """
+        try:
+            return WebDriverWait(self.browser, timeout, poll_frequency=0.1).until(condition)
+        except Exception as e:
+            logging.error(f"Failed to wait for {description}: {e}")
+            raise
+
     def press_key(self, key: str) -> None:
         """Press a key using ActionChains."""
         try:
@@ -177,6 +371,7 @@ class AbstractScraper(ABC):
             logging.error(f"Failed to press key '{key}': {e}")
             raise
 
+    @instrumented("navigate")
     def navigate_to_url(self, url: str) -> None:
         """
         Navigate to a specified URL.
@@ -189,7 +384,23 @@ class AbstractScraper(ABC):
         except Exception as e:
             logging.error(f"Failed to navigate to URL '{url}': {e}")
             raise
+        if self.resource_policy and self.resource_policy.get("report"):
+            self._report_network_stats(url)
+
+    def _report_network_stats(self, url: str) -> None:
+        """Log the requests blocked and bytes transferred by the previous page load and add them to the run totals."""
+        try:
+            stats = GenericBrowserProvider.read_network_stats(self.browser)
+        except Exception as e:
+            logging.warning(f"Unable to read network stats: {e}")
+            return
+        with self._lock:
+            self.network_totals["pages"] += 1
+            for key, value in stats.items():
+                self.network_totals[key] += value
+        logging.info(f"Network for '{url}': {stats['requests']} requests, {stats['blocked_requests']} blocked, {stats['bytes_transferred']} bytes transferred.")
 
+    @instrumented("element_read")
     def get_element_text(self, by: str, identifier: str) -> str:
         """
         Get the text of an element identified by a selector.
@@ -0,0 +1,110 @@
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from tools.metrics import instrumented
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+ROW_TEXTS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), (link) => {
+    const row = link.closest('tr') || link;
+    return [link.href, row.innerText.trim()];
+});
+"""
+
+class Paginator:
+    """Walks the listing pages of a scraper, waiting on page signals instead of fixed sleeps."""
+
+    def __init__(self, scraper, configs: dict):
+        self.scraper = scraper
+        self.configs = configs
+        self.navigation = configs["navigation"]
+        self.rows_selector = configs["table"]["schools"]
+        self.timeout = self.navigation["page_ready_timeout"]
+        self.pages_total = None
+        self.listing_texts = {}
+
+    @property
+    def metrics(self):
+        return self.scraper.metrics
+
+    @instrumented("pagination_setup")
+    def select_results_per_page(self) -> None:
+        """Open the results-per-page dropdown and pick the configured option."""
+        dropdown = self.configs["dropdown"]
+        listbox = (By.CSS_SELECTOR, dropdown["listbox"])
+
+        self.scraper.wait_and_click("xpath", dropdown["input_class"])
+        for _ in range(dropdown["key_presses"]):
+            self.scraper.press_key("ARROW_DOWN")
+            self.scraper.wait_until(EC.presence_of_element_located(listbox), self.timeout, "dropdown to open")
+            self.scraper.press_key("RETURN")
+            self.scraper.wait_until(EC.invisibility_of_element_located(listbox), self.timeout, "dropdown to close")
+
+        self.scraper.wait_until(
+            lambda browser: len(self.get_row_urls()) >= self.navigation["results_per_page"],
+            self.timeout,
+            f"{self.navigation['results_per_page']} rows per page"
+        )
+
+    def get_row_urls(self) -> list:
+        """Collect the URL of every row of the current page in one query."""
+        return self.scraper.get_elements_attribute(self.rows_selector, "href")
+
+    def get_row_texts(self) -> dict:
+        """Map the URL of every row of the current page to the text of its listing row, in one query."""
+        try:
+            return dict(self.scraper.browser.execute_script(ROW_TEXTS_SCRIPT, self.rows_selector))
+        except Exception as e:
+            logging.error(f"Failed to get the listing row texts: {e}")
+            raise
+
+    @instrumented("pagination")
+    def next_page(self, current_urls: list) -> list:
+        """Click the next-page button and wait until the rows differ from 'current_urls'."""
+        self.scraper.wait_and_click("css_selector", self.navigation["next_page"])
+        return self.scraper.wait_until(
+            lambda browser: self._rows_changed(current_urls),
+            self.timeout,
+            "the next page rows"
+        )
+
+    def _rows_changed(self, previous_urls: list):
+        urls = self.get_row_urls()
+        return urls if urls and urls != previous_urls else False
+
+    def discover_total_pages(self) -> int:
+        """Read the total page count from the numbered buttons of the pagination widget."""
+        labels = self.scraper.get_elements_attribute(self.navigation["pagination_buttons"], "textContent")
+        pages = [int(label.strip()) for label in labels if label and label.strip().isdigit()]
+        if not pages:
+            raise ValueError("Unable to discover the total number of pages from the pagination widget.")
+        return max(pages)
+
+    def iter_pages(self, pages_limit: int = None, track_listing: bool = False):
+        """
+        Yield the page number and row URLs of each listing page, one page at a time.
+
+        :param pages_limit: Optional maximum number of pages. The total is always discovered from the pagination widget.
+        :param track_listing: Also keep the text of each listing row in 'listing_texts', for change detection.
+        """
+        page_urls = self.scraper.wait_until(lambda browser: self.get_row_urls(), self.timeout, "the listing rows")
+        pages_total = self.discover_total_pages()
+        if pages_limit and pages_limit < pages_total:
+            logging.info(f"Limiting the scrape to {pages_limit} of {pages_total} pages.")
+            pages_total = pages_limit
+        else:
+            logging.info(f"Discovered {pages_total} listing pages.")
+
+        self.pages_total = pages_total
+        for page in range(1, pages_total + 1):
+            logging.info(f"Collected {len(page_urls)} URLs from listing page {page}.")
+            if track_listing:
+                self.listing_texts.update(self.get_row_texts())
+            yield page, page_urls
+            if page < pages_total:
+                page_urls = self.next_page(page_urls)
+
+    def collect_urls(self, pages_limit: int = None) -> list:
+        """Collect the row URLs of every listing page."""
+        return [url for _, page_urls in self.iter_pages(pages_limit) for url in page_urls]
@@ -0,0 +1,28 @@
+import importlib
+from browser.config_scraper import ConfigScraper
+
+# Sites with a dedicated scraper class, by config name, imported on first use. Other sites use ConfigScraper.
+SCRAPERS = {
+    'txschools': 'browser.txschools_scraper.TXSchoolsScraper'
+}
+
+def register_scraper(name: str, scraper_class) -> None:
+    """Register the scraper class (or its dotted path) of a site. It takes the keyword arguments of ConfigScraper, except 'name'."""
+    SCRAPERS[name] = scraper_class
+
+
+def get_scraper_class(name: str) -> type:
+    """Return the scraper class registered for a site config, or the generic ConfigScraper."""
+    scraper_class = SCRAPERS.get(name, ConfigScraper)
+    if isinstance(scraper_class, str):
+        module_name, class_name = scraper_class.rsplit('.', 1)
+        scraper_class = getattr(importlib.import_module(module_name), class_name)
+    return scraper_class
+
+
+def create_scraper(name: str, configs: dict = None, **options) -> ConfigScraper:
+    """Create the scraper of a site config, with the options of ConfigScraper (resume, incremental, capture, browser_pool)."""
+    scraper_class = get_scraper_class(name)
+    if scraper_class is ConfigScraper:
+        return ConfigScraper(name, configs, **options)
+    return scraper_class(configs=configs, **options)
@@ -0,0 +1,146 @@
+import os
+import json
+import logging
+from typing import Dict, List
+from browser.provider.actions.dict import action_dict
+from tools.html_parser import compile_selector
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CONFIGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'configs')
+
+REQUIRED_KEYS = {
+    "link": ["path"],
+    "script": ["before"],
+    "table": ["schools"],
+    "dropdown": ["input_class", "listbox", "key_presses"],
+    "navigation": ["load_timeout", "page_ready_timeout", "results_per_page", "pages_total", "next_page", "pagination_buttons"],
+    "extraction": ["engine", "fields", "attributes", "http"],
+    "resources": [],
+    "lifecycle": ["max_pages", "max_rss_mb", "rss_check_interval", "max_crash_requeues"],
+    "concurrency": ["workers", "base_port", "orchestrator", "max_pending_urls"],
+    "rate_limit": [],
+    "retry": [],
+    "checkpoint": ["filename", "key_param"],
+    "incremental": ["filename", "changes_filename", "raw_changes_filename", "skip_unchanged_listing"],
+    "distributed": ["backend", "filename", "visibility_timeout", "poll_interval", "batch_size", "storage_backend"],
+    "metrics": ["format", "filename", "trace_sample_rate", "traces_filename"],
+    "capture": ["enabled", "html", "filename", "offline_filename"],
+    "consolidation": ["columns"],
+    "storage": ["filename", "raw_filename", "failed_filename", "headers", "failed_headers", "backend", "column_types", "indexed_columns", "batch_size"]
+}
+CHOICES = {
+    ("extraction", "engine"): ("browser", "http"),
+    ("concurrency", "orchestrator"): ("threads", "asyncio"),
+    ("storage", "backend"): ("csv", "parquet", "sqlite"),
+    ("distributed", "storage_backend"): ("csv", "parquet", "sqlite"),
+    ("metrics", "format"): ("prometheus", "json")
+}
+# Sections naming files: two sites running together must not share any of them.
+OUTPUT_FILENAMES = [
+    ("storage", "filename"), ("storage", "raw_filename"), ("storage", "failed_filename"), ("checkpoint", "filename"),
+    ("incremental", "filename"), ("incremental", "changes_filename"), ("incremental", "raw_changes_filename"),
+    ("distributed", "filename"), ("metrics", "filename"), ("capture", "filename"), ("capture", "offline_filename")
+]
+
+
+def list_site_configs() -> List[str]:
+    """Return the names of the site configs in the configs directory."""
+    return sorted(filename[:-len('.json')] for filename in os.listdir(CONFIGS_DIR) if filename.endswith('.json'))
+
+
+def validate_config(name: str, configs: dict) -> List[str]:
+    """Return the problems of a site config: missing sections or keys, unsupported values and unknown fields or actions."""
+    problems = []
+    for section, keys in REQUIRED_KEYS.items():
+        if not isinstance(configs.get(section), dict):
+            problems.append(f"missing section '{section}'")
+            continue
+        problems += [f"missing key '{section}.{key}'" for key in keys if key not in configs[section]]
+    if problems:
+        return [f"{name}: {problem}" for problem in problems]
+
+    for (section, key), choices in CHOICES.items():
+        if configs[section][key] not in choices:
+            problems.append(f"'{section}.{key}' must be one of {list(choices)}, not '{configs[section][key]}'")
+    if not isinstance(configs["concurrency"]["workers"], int) or configs["concurrency"]["workers"] < 1:
+        problems.append("'concurrency.workers' must be a positive integer")
+    if not isinstance(configs["concurrency"]["max_pending_urls"], int) or configs["concurrency"]["max_pending_urls"] < 1:
+        problems.append("'concurrency.max_pending_urls' must be a positive integer")
+
+    for action in configs["script"]["before"] or {}:
+        if action not in action_dict:
+            problems.append(f"unknown action '{action}' in 'script.before'")
+
+    extraction = configs["extraction"]
+    if not extraction["fields"]:
+        problems.append("'extraction.fields' is empty")
+    for field in extraction["fields"]:
+        if field not in configs["table"]:
+            problems.append(f"field '{field}' has no selector in 'table'")
+    for field in extraction["attributes"]:
+        if field not in extraction["fields"]:
+            problems.append(f"attribute of unknown field '{field}' in 'extraction.attributes'")
+    return [f"{name}: {problem}" for problem in problems]
+
+
+def compile_detail_selectors(name: str, configs: dict) -> Dict[str, str]:
+    """
+    Return the selector of each detail field, compiled for the HTML parser of the 'http' engine and offline re-extraction.
+
+    A selector outside the subset supported by the parser is an error for the 'http' engine; the browser engine
+    only logs it, as such selectors still work in the browser.
+    """
+    selectors = {field: configs["table"][field] for field in configs["extraction"]["fields"]}
+    for field, selector in selectors.items():
+        try:
+            compile_selector(selector)
+        except ValueError as e:
+            if configs["extraction"]["engine"] == "http":
+                raise ValueError(f"{name}: selector of field '{field}' is not supported by the 'http' engine: {e}") from e
+            logging.warning(f"{name}: selector of field '{field}' cannot be used for offline re-extraction: {e}")
+    return selectors
+
+
+def load_config(name: str) -> dict:
+    """Load and validate a site config, raising ValueError with every problem found."""
+    config_path = os.path.join(CONFIGS_DIR, f'{name}.json')
+    try:
+        with open(config_path, 'r') as file:
+            configs = json.load(file)
+    except FileNotFoundError:
+        logging.error(f"Configuration file '{config_path}' not found.")
+        raise
+    except (IOError, json.JSONDecodeError) as e:
+        logging.error(f"Error reading configuration file '{config_path}': {e}")
+        raise
+
+    problems = validate_config(name, configs)
+    if problems:
+        raise ValueError("Invalid scraper configuration:\n" + "\n".join(problems))
+    return configs
+
+
+def load_configs(names: List[str]) -> Dict[str, dict]:
+    """Load and validate the configs of sites run together, checking that no two sites write to the same files."""
+    configs = {}
+    problems = []
+    for name in names:
+        try:
+            configs[name] = load_config(name)
+            compile_detail_selectors(name, configs[name])
+        except (OSError, ValueError) as e:
+            problems.append(str(e))
+    if problems:
+        raise ValueError("\n".join(problems))
+
+    owners = {}
+    for name, site_configs in configs.items():
+        for section, key in OUTPUT_FILENAMES:
+            filename = site_configs[section][key]
+            if filename in owners and owners[filename] != name:
+                problems.append(f"{name}: '{section}.{key}' file '{filename}' is also used by '{owners[filename]}'")
+            owners.setdefault(filename, name)
+    if problems:
+        raise ValueError("Conflicting scraper configurations:\n" + "\n".join(problems))
+    return configs
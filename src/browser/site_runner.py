@@ -0,0 +1,79 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from browser.scrapers.registry import create_scraper
+from browser.scrapers.scraper_config import load_configs
+from browser.provider.browser_session import BrowserSessionManager
+from browser.provider.shared_browser_pool import SharedBrowserPool
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+def merge_resource_policies(policies: List[dict]) -> dict:
+    """Resource policy of browsers shared by several sites: only what every site blocks is blocked, and hosts are only restricted if every site restricts them."""
+    restricted = all(policy.get("allow_hosts") for policy in policies)
+    return {
+        "block_types": [block_type for block_type in policies[0].get("block_types", []) if all(block_type in policy.get("block_types", []) for policy in policies)],
+        "deny": [pattern for pattern in policies[0].get("deny", []) if all(pattern in policy.get("deny", []) for policy in policies)],
+        "allow_hosts": list(dict.fromkeys(host for policy in policies for host in policy["allow_hosts"])) if restricted else [],
+        "report": any(policy.get("report") for policy in policies)
+    }
+
+
+def merge_lifecycles(lifecycles: List[dict]) -> dict:
+    """Lifecycle of browsers shared by several sites: the strictest of the limits set by the sites."""
+    merged = {}
+    for key in ("max_pages", "max_rss_mb", "rss_check_interval", "max_crash_requeues"):
+        values = [lifecycle[key] for lifecycle in lifecycles if lifecycle.get(key)]
+        merged[key] = min(values) if values else 0
+    return merged
+
+
+class SiteRunner:
+    """
+    Scrapes several site configs in one process.
+
+    Every config is loaded and validated before any browser is launched. The listing of each site is read by a
+    browser of its own, for at most 'max_concurrent_sites' sites at a time, while the detail pages of all the
+    sites share the 'workers' browsers of one SharedBrowserPool. Each site writes to the files of its own config.
+    """
+
+    def __init__(self, names: List[str], workers: int = 4, max_concurrent_sites: int = 2, base_port: int = 9223,
+                 resume: bool = False, incremental: bool = False, capture: bool = False):
+        if not names:
+            raise ValueError("No site to scrape.")
+        self.names = list(dict.fromkeys(names))
+        self.workers = workers
+        self.max_concurrent_sites = max_concurrent_sites
+        self.base_port = base_port
+        self.options = {"resume": resume, "incremental": incremental, "capture": capture}
+
+    def run(self) -> Dict[str, int]:
+        """Scrape every site, and return the number of URLs that failed for each."""
+        configs = load_configs(self.names)
+        session_manager = BrowserSessionManager(
+            resource_policy=merge_resource_policies([configs[name]["resources"] for name in self.names]),
+            lifecycle=merge_lifecycles([configs[name]["lifecycle"] for name in self.names])
+        )
+        pool = SharedBrowserPool(self.workers, session_manager, base_port=self.base_port, max_crash_requeues=session_manager.lifecycle["max_crash_requeues"])
+
+        scrapers = []
+        for index, name in enumerate(self.names):
+            scraper = create_scraper(name, configs[name], browser_pool=pool, **self.options)
+            # Listing browsers run next to the shared workers, so each needs its own debugging port.
+            scraper.debugging_port = self.base_port + self.workers + index
+            scrapers.append(scraper)
+
+        logging.info(f"Scraping {len(scrapers)} sites with {self.workers} shared browsers, {self.max_concurrent_sites} listings at a time.")
+        pool.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_sites, thread_name_prefix="site") as executor:
+                list(executor.map(self._scrape, scrapers))
+        finally:
+            pool.close()
+        return {scraper.name: len(scraper.failed_urls) for scraper in scrapers}
+
+    @staticmethod
+    def _scrape(scraper) -> None:
+        logging.info(f"Scraping site '{scraper.name}'.")
+        scraper.scrape()
+        logging.info(f"Site '{scraper.name}' done, {len(scraper.failed_urls)} URLs failed.")
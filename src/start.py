@@ -1,3 +1,51 @@
-from browser.txschools_scraper import TXSchoolsScraper
+import argparse
+from browser.scrapers.registry import create_scraper
+from browser.scrapers.scraper_config import list_site_configs
+from browser.site_runner import SiteRunner
 
-txschools = TXSchoolsScraper().scrape()
+parser = argparse.ArgumentParser(description="Scrape school information from TX Schools.")
+parser.add_argument(
+    "command",
+    nargs="?",
+    default="scrape",
+    choices=["scrape", "retry-failed", "schedule", "discover", "enrich"],
+    help="'retry-failed' reprocesses the URLs of the failed-URLs file that have not succeeded since. "
+         "'schedule' queues a distributed crawl, run by any number of 'discover' (listing) and 'enrich' (detail pages) workers."
+)
+parser.add_argument("--site", default="txschools", help="Site config to run, from 'src/browser/scrapers/configs'.")
+parser.add_argument("--sites", help="Comma-separated site configs to scrape in one process with shared browsers, or 'all'.")
+parser.add_argument("--shared-workers", type=int, default=4, help="Number of browsers shared by the detail pages of '--sites'.")
+parser.add_argument("--max-concurrent-sites", type=int, default=2, help="Number of '--sites' whose listing is read at the same time.")
+parser.add_argument("--resume", action="store_true", help="Continue the last run from its checkpoint instead of starting from page 1.")
+parser.add_argument("--incremental", action="store_true", help="Only scrape new or changed schools and record upserts and deletions.")
+parser.add_argument("--capture", action="store_true", help="Archive the raw fields of every page for offline re-extraction.")
+parser.add_argument("--offline", action="store_true", help="Rerun extraction and post-processing from the capture archive, without a browser.")
+parser.add_argument("--worker-id", help="Name of a distributed worker, defaults to the host name and process ID.")
+args = parser.parse_args()
+
+if args.sites and (args.command != "scrape" or args.offline):
+    parser.error("'--sites' only runs scrapes: use '--site' to run another command, one site at a time.")
+
+if args.sites:
+    names = list_site_configs() if args.sites == "all" else [name.strip() for name in args.sites.split(",") if name.strip()]
+    failures = SiteRunner(
+        names,
+        workers=args.shared_workers,
+        max_concurrent_sites=args.max_concurrent_sites,
+        resume=args.resume,
+        incremental=args.incremental,
+        capture=args.capture
+    ).run()
+    print(f"Failed URLs per site: {failures}")
+elif args.offline:
+    create_scraper(args.site).rerun_offline()
+elif args.command == "schedule":
+    create_scraper(args.site).schedule_crawl()
+elif args.command == "discover":
+    create_scraper(args.site).run_discovery_worker(args.worker_id)
+elif args.command == "enrich":
+    create_scraper(args.site, capture=args.capture).run_enrich_worker(args.worker_id)
+elif args.command == "retry-failed":
+    create_scraper(args.site, capture=args.capture).retry_failed()
+else:
+    scraper = create_scraper(args.site, resume=args.resume, incremental=args.incremental, capture=args.capture).scrape()
@@ -0,0 +1,78 @@
+import json
+import zlib
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+from tools.url_utils import get_query_param
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+class CaptureStore:
+    """
+    Compressed archive of the raw field payload (and optionally the rendered HTML) of each scraped page.
+
+    Payloads are zlib-compressed JSON in a SQLite file, indexed by school ID and execution date, so
+    extraction and post-processing can be rerun offline without a browser.
+    """
+
+    def __init__(self, filename: str, key_param: str = 'id'):
+        self.filename = filename
+        self.key_param = key_param
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(f'{self.filename}.db', check_same_thread=False)
+        self._initialize_db()
+
+    def _initialize_db(self) -> None:
+        with self._lock, self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS captures (
+                    school_id TEXT NOT NULL,
+                    execution_date TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    fields BLOB NOT NULL,
+                    html BLOB,
+                    captured_at TEXT,
+                    PRIMARY KEY (school_id, execution_date)
+                );
+                CREATE INDEX IF NOT EXISTS captures_execution_date ON captures (execution_date);
+            """)
+
+    def save(self, url: str, execution_date: str, fields: dict, html: Optional[str] = None) -> None:
+        """Store the raw fields of a page, replacing any capture of the same school in the same run."""
+        school_id = get_query_param(url, self.key_param) or url
+        compressed_fields = zlib.compress(json.dumps(fields).encode('utf-8'))
+        compressed_html = zlib.compress(html.encode('utf-8')) if html is not None else None
+        try:
+            with self._lock, self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO captures (school_id, execution_date, url, fields, html, captured_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (school_id, execution_date, url, compressed_fields, compressed_html, datetime.now().isoformat())
+                )
+        except Exception as e:
+            logging.error(f"Failed to capture URL '{url}': {e}")
+            raise
+
+    def latest_execution_date(self) -> Optional[str]:
+        with self._lock:
+            row = self.connection.execute("SELECT MAX(execution_date) FROM captures").fetchone()
+        return row[0] if row else None
+
+    def iter_captures(self, execution_date: str, batch_size: int = 500) -> Iterator[Tuple[str, dict, Optional[str]]]:
+        """Yield the URL, raw fields and HTML of every page captured in a run, reading the archive in batches."""
+        last_school_id = ''
+        while True:
+            with self._lock:
+                rows = self.connection.execute(
+                    "SELECT school_id, url, fields, html FROM captures WHERE execution_date = ? AND school_id > ? ORDER BY school_id LIMIT ?",
+                    (execution_date, last_school_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for school_id, url, fields, html in rows:
+                yield url, json.loads(zlib.decompress(fields)), zlib.decompress(html).decode('utf-8') if html is not None else None
+            last_school_id = rows[-1][0]
+
+    def close(self) -> None:
+        self.connection.close()
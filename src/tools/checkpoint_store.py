@@ -0,0 +1,104 @@
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import List, Optional
+from tools.url_utils import get_query_param
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+class CheckpointStore:
+    """SQLite checkpoint of a crawl: enumerated listing pages and the status of each detail URL, keyed by school ID."""
+
+    def __init__(self, filename: str, key_param: str = 'id'):
+        self.filename = filename
+        self.key_param = key_param
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(f'{self.filename}.db', check_same_thread=False)
+        self._initialize_db()
+
+    def _initialize_db(self) -> None:
+        with self._lock, self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS pages (page INTEGER PRIMARY KEY, url_count INTEGER, enumerated_at TEXT);
+                CREATE TABLE IF NOT EXISTS urls (
+                    school_id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    page INTEGER,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    updated_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS urls_status ON urls (status);
+            """)
+
+    def key(self, url: str) -> str:
+        """Return the school ID of a detail URL, falling back to the URL itself."""
+        return get_query_param(url, self.key_param) or url
+
+    def reset(self) -> None:
+        """Discard every checkpoint, for a fresh run."""
+        with self._lock, self.connection:
+            self.connection.executescript("DELETE FROM meta; DELETE FROM pages; DELETE FROM urls;")
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def enumerated_pages(self) -> set:
+        with self._lock:
+            return {row[0] for row in self.connection.execute("SELECT page FROM pages")}
+
+    def mark_page_enumerated(self, page: int, urls: List[str]) -> List[str]:
+        """Record a listing page and its URLs as pending. Returns the URLs still pending."""
+        now = datetime.now().isoformat()
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO urls (school_id, url, page, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(self.key(url), url, page, PENDING, now) for url in urls]
+            )
+            self.connection.execute("INSERT OR REPLACE INTO pages (page, url_count, enumerated_at) VALUES (?, ?, ?)", (page, len(urls), now))
+            pending = {row[0] for row in self.connection.execute("SELECT url FROM urls WHERE page = ? AND status = ?", (page, PENDING))}
+        return [url for url in urls if url in pending]
+
+    def mark_done(self, urls: List[str]) -> None:
+        self._set_status(urls, DONE)
+
+    def mark_failed(self, url: str, error: str = None) -> None:
+        self._set_status([url], FAILED, error)
+
+    def mark_pending(self, urls: List[str]) -> None:
+        self._set_status(urls, PENDING)
+
+    def _set_status(self, urls: List[str], status: str, error: str = None) -> None:
+        now = datetime.now().isoformat()
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO urls (school_id, url, status, error, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (school_id) DO UPDATE SET status = excluded.status, error = excluded.error, updated_at = excluded.updated_at",
+                [(self.key(url), url, status, error, now) for url in urls]
+            )
+
+    def urls_with_status(self, status: str) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self.connection.execute("SELECT url FROM urls WHERE status = ? ORDER BY page, rowid", (status,))]
+
+    def pending_urls(self) -> List[str]:
+        return self.urls_with_status(PENDING)
+
+    def status_counts(self) -> dict:
+        with self._lock:
+            return dict(self.connection.execute("SELECT status, COUNT(*) FROM urls GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        self.connection.close()
@@ -1,52 +1,93 @@
+import os
+import csv
+import threading
 import pandas as pd
-from typing import TypeVar, Generic, List, Union
+from typing import TypeVar, Generic, List, Union, Callable, Optional
 import logging
+from tools.storage_backend import StorageBackend
+from tools.metrics import instrumented
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
 T = TypeVar('T', bound=pd.DataFrame)
 
-class CsvHandler(Generic[T]):
+def read_csv_header(path: str) -> List[str]:
+    """Return the header row of a CSV file, or an empty list if the file is missing or empty."""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', newline='') as file:
+        return next(csv.reader(file), [])
+
+def ensure_csv_header(path: str, columns: List[str]) -> List[str]:
+    """
+    Make sure the CSV file header contains every column in 'columns' and return the header.
+
+    Missing files get a header row. Existing files missing some of the columns are rewritten once
+    with the extra columns appended, so later appends never need to rewrite the file.
+    """
+    header = read_csv_header(path)
+    if not header:
+        with open(path, 'w', newline='') as file:
+            csv.writer(file).writerow(columns)
+        return list(columns)
+
+    missing = [column for column in columns if column not in header]
+    if missing:
+        logging.info(f"Adding columns {missing} to '{path}'.")
+        existing_df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        existing_df.reindex(columns=header + missing).to_csv(path, index=False)
+        header = header + missing
+    return header
+
+
+class CsvHandler(StorageBackend, Generic[T]):
     def __init__(self, filename: str, headers: List[str]):
-        self.filename = filename
-        self.headers = headers
+        super().__init__(filename, headers)
         self._initialize_csv()
 
     def _initialize_csv(self) -> None:
         """Initialize the CSV file with headers if it does not exist."""
-        try:
-            pd.read_csv(f'{self.filename}.csv')
+        if os.path.exists(f'{self.filename}.csv'):
             logging.info(f"CSV file '{self.filename}.csv' already exists.")
-        except FileNotFoundError:
-            df = pd.DataFrame(columns=self.headers)
-            df.to_csv(f'{self.filename}.csv', index=False)
+        else:
+            ensure_csv_header(f'{self.filename}.csv', self.headers)
             logging.info(f"CSV file '{self.filename}.csv' created with headers.")
 
     def save_data(self, data: Union[pd.DataFrame, List[dict]]) -> None:
-        """Save the provided data to the CSV file, appending if necessary."""
-        try:
-            existing_df = pd.read_csv(self.filename)
-            if isinstance(data, pd.DataFrame):
-                combined_df = pd.concat([existing_df, data], ignore_index=True)
-            else:
-                new_data_df = pd.DataFrame(data, columns=self.headers)
-                combined_df = pd.concat([existing_df, new_data_df], ignore_index=True)
-        except FileNotFoundError:
-            if isinstance(data, pd.DataFrame):
-                combined_df = data
-            else:
-                combined_df = pd.DataFrame(data, columns=self.headers)
-        
+        """Append the provided data to the CSV file, without rewriting the existing rows."""
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data, columns=self.headers)
+
         try:
-            combined_df.to_csv(f'{self.filename}.csv', index=False)
+            header = ensure_csv_header(f'{self.filename}.csv', list(data.columns))
+            data.reindex(columns=header).to_csv(f'{self.filename}.csv', mode='a', header=False, index=False)
         except Exception as e:
             logging.error(f"Failed to save data to '{self.filename}.csv': {e}")
             raise
 
-    def read_data(self) -> pd.DataFrame:
-        """Read and return the contents of the CSV file as a DataFrame."""
+    def read_data(self, where: Optional[dict] = None, columns: Optional[List[str]] = None, chunksize: int = 10000) -> pd.DataFrame:
+        """
+        Read and return the contents of the CSV file as a DataFrame of text, optionally only some columns,
+        so identifiers such as School IDs keep their leading zeros.
+
+        With 'where', only the rows whose columns equal the given values are returned, and the file is
+        read in chunks so the unmatched rows are never held in memory.
+        """
         try:
-            df = pd.read_csv(f'{self.filename}.csv')
+            wanted = set(columns + list(where or {})) if columns else None
+            usecols = (lambda column: column in wanted) if wanted else None
+            if where:
+                matches = []
+                for chunk in pd.read_csv(f'{self.filename}.csv', dtype=str, usecols=usecols, chunksize=chunksize):
+                    mask = pd.Series(True, index=chunk.index)
+                    for column, value in where.items():
+                        mask &= chunk[column] == value
+                    matches.append(chunk[mask])
+                df = pd.concat(matches, ignore_index=True) if matches else pd.DataFrame(columns=read_csv_header(f'{self.filename}.csv'))
+            else:
+                df = pd.read_csv(f'{self.filename}.csv', dtype=str, usecols=usecols)
+            if columns:
+                df = df.reindex(columns=columns)
             logging.info(f"Data read from '{self.filename}.csv'.")
             return df
         except FileNotFoundError:
@@ -54,4 +95,88 @@ class CsvHandler(Generic[T]):
             raise
         except Exception as e:
             logging.error(f"Failed to read data from '{self.filename}.csv': {e}")
-            raise
\ No newline at end of file
+            raise
+
+
+class CsvStreamWriter:
+    """
+    Append-only CSV writer that flushes rows in batches, with a constant cost per row.
+
+    Rows can carry a tag (e.g. their source URL); 'on_flush' receives the tags of each batch once it is on disk.
+    """
+
+    def __init__(self, filename: str, headers: List[str], batch_size: int = 50, on_flush: Optional[Callable[[list], None]] = None, metrics=None):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.on_flush = on_flush
+        self.metrics = metrics
+        self.header = ensure_csv_header(f'{self.filename}.csv', headers)
+        self.rows = []
+        self.tags = []
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self._file = open(f'{self.filename}.csv', 'a', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.header, restval='')
+
+    def write(self, row: dict, tag=None) -> None:
+        """Buffer a row, flushing the buffer to disk once it reaches the batch size."""
+        with self._lock:
+            self.rows.append(row)
+            if tag is not None:
+                self.tags.append(tag)
+            if len(self.rows) >= self.batch_size:
+                self._flush()
+
+    @instrumented("csv_flush")
+    def write_frame(self, df: pd.DataFrame) -> None:
+        """Append a batch of rows at once, aligned on the file header, and fsync the file."""
+        with self._lock:
+            self._flush()
+            try:
+                df.reindex(columns=self.header).to_csv(self._file, header=False, index=False)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self.rows_written += len(df)
+            except Exception as e:
+                logging.error(f"Failed to append data to '{self.filename}.csv': {e}")
+                raise
+
+    def flush(self) -> None:
+        """Write the buffered rows and fsync the file."""
+        with self._lock:
+            self._flush()
+
+    @instrumented("csv_flush")
+    def _flush(self) -> None:
+        if not self.rows:
+            return
+        try:
+            self._writer.writerows(self.rows)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.rows_written += len(self.rows)
+            self.rows = []
+        except Exception as e:
+            logging.error(f"Failed to append data to '{self.filename}.csv': {e}")
+            raise
+
+        tags, self.tags = self.tags, []
+        if self.on_flush and tags:
+            self.on_flush(tags)
+
+    def close(self) -> None:
+        """Flush the remaining rows and close the file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._flush()
+            finally:
+                self._file.close()
+        logging.info(f"{self.rows_written} rows written to '{self.filename}.csv'.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,72 @@
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import List, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+def fingerprint(value) -> str:
+    """Return a stable SHA-256 fingerprint of a string or a JSON-serializable value."""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+class FingerprintStore:
+    """SQLite store of per-school fingerprints from previous runs, used by incremental refreshes."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(f'{self.filename}.db', check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._initialize_db()
+
+    def _initialize_db(self) -> None:
+        with self._lock, self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS schools (
+                    school_id TEXT PRIMARY KEY,
+                    url TEXT,
+                    listing_hash TEXT,
+                    content_hash TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    last_seen TEXT,
+                    updated_at TEXT
+                )
+            """)
+
+    def get(self, school_id: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self.connection.execute("SELECT * FROM schools WHERE school_id = ?", (school_id,)).fetchone()
+
+    def upsert(self, school_id: str, **values) -> None:
+        """Insert or update the given columns of a school."""
+        columns = ['school_id'] + list(values)
+        updates = ', '.join(f'{column} = excluded.{column}' for column in values)
+        with self._lock, self.connection:
+            self.connection.execute(
+                f"INSERT INTO schools ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+                f"ON CONFLICT (school_id) DO UPDATE SET {updates}",
+                [school_id] + list(values.values())
+            )
+
+    def mark_seen(self, school_ids: List[str], execution_date: str) -> None:
+        with self._lock, self.connection:
+            self.connection.executemany("UPDATE schools SET last_seen = ? WHERE school_id = ?", [(execution_date, school_id) for school_id in school_ids])
+
+    def unseen_since(self, execution_date: str) -> List[str]:
+        """Return the schools not seen in the listing of the run started at 'execution_date'."""
+        with self._lock:
+            rows = self.connection.execute("SELECT school_id FROM schools WHERE last_seen IS NULL OR last_seen != ?", (execution_date,))
+            return [row[0] for row in rows]
+
+    def delete(self, school_ids: List[str]) -> None:
+        with self._lock, self.connection:
+            self.connection.executemany("DELETE FROM schools WHERE school_id = ?", [(school_id,) for school_id in school_ids])
+
+    def close(self) -> None:
+        self.connection.close()
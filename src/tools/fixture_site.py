@@ -0,0 +1,312 @@
+import json
+import time
+import random
+import logging
+import threading
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, NamedTuple
+from urllib.parse import urlparse, parse_qs
+from tools.capture_store import CaptureStore
+from tools.url_utils import get_query_param
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+ERROR = 'error'
+HANG = 'hang'
+
+CITIES = [("Austin", "78701"), ("Weslaco", "78596"), ("Floydada", "79235"), ("Houston", "77002"), ("El Paso", "79901"), ("Lubbock", "79401")]
+GRADES = ["Prekindergarten - Grade 5", "Grade 6 - Grade 8", "Grade 9 - Grade 12", "Early Education - Grade 5"]
+
+LISTING_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>TX Schools - Fixture</title></head>
+<body>
+<div id="app_top">
+  <div class="MuiToolbar-root">Find a school</div>
+  <div class="MuiGrid-root MuiGrid-container">
+    <div class="MuiGrid-root MuiGrid-container MuiGrid-item MuiGrid-grid-xs-12 MuiGrid-grid-lg-8">
+      <div><div><div class="MuiFormControl-root"><div><div><div id="page-size" class="MuiSelect-root" role="button" tabindex="0"></div></div></div></div></div></div>
+      <div>
+        <div><div><div><table><tbody id="rows"></tbody></table></div></div></div>
+        <span id="count"></span>
+        <span><nav><ul id="pagination"></ul></nav></span>
+      </div>
+    </div>
+  </div>
+</div>
+<script>
+const SCHOOLS = __SCHOOLS__;
+const PAGE_SIZES = __PAGE_SIZES__;
+const LATENCY = __LATENCY__;
+const JITTER = __JITTER__;
+let pageSize = PAGE_SIZES[0];
+let page = 1;
+let listbox = null;
+// No option is chosen until the first selection, so the first key press highlights the first option.
+let highlighted = -1;
+
+function delay() { return 1000 * (LATENCY + Math.random() * JITTER); }
+function totalPages() { return Math.max(1, Math.ceil(SCHOOLS.length / pageSize)); }
+
+// Always eight items between the previous and next buttons, so the next button stays the tenth item.
+function pageItems(current, total) {
+  let items;
+  if (total <= 8) items = Array.from({length: total}, (_, i) => i + 1);
+  else if (current <= 4) items = [1, 2, 3, 4, 5, 6, '...', total];
+  else if (current >= total - 3) items = [1, '...'].concat(Array.from({length: 6}, (_, i) => total - 5 + i));
+  else items = [1, '...', current - 2, current - 1, current, current + 1, '...', total];
+  while (items.length < 8) items.push(null);
+  return items;
+}
+
+function render() {
+  const start = (page - 1) * pageSize;
+  document.getElementById('rows').innerHTML = SCHOOLS.slice(start, start + pageSize).map(([id, name, district, city]) =>
+    `<tr><td><div><a href="/?view=school&id=${id}&lng=en">${name}</a></div></td><td>${district}</td><td>${city}</td></tr>`).join('');
+  const total = totalPages();
+  const items = pageItems(page, total).map((item) =>
+    item === null ? '<li></li>' : item === '...' ? '<li><div>...</div></li>' : `<li><button type="button" data-page="${item}">${item}</button></li>`);
+  document.getElementById('pagination').innerHTML =
+    `<li><button type="button" data-page="${page - 1}" ${page === 1 ? 'disabled' : ''}>&lsaquo;</button></li>` + items.join('') +
+    `<li><button type="button" data-page="${page + 1}" ${page === total ? 'disabled' : ''}>&rsaquo;</button></li>`;
+  document.getElementById('count').textContent = `${SCHOOLS.length} schools`;
+  document.getElementById('page-size').textContent = pageSize;
+}
+
+function go(target) {
+  if (target < 1 || target > totalPages()) return;
+  setTimeout(() => { page = target; render(); }, delay());
+}
+
+function openOrMove() {
+  if (listbox === null) {
+    listbox = document.createElement('ul');
+    listbox.setAttribute('role', 'listbox');
+    listbox.innerHTML = PAGE_SIZES.map((size) => `<li role="option">${size}</li>`).join('');
+    document.body.appendChild(listbox);
+  }
+  highlighted = Math.min(highlighted + 1, PAGE_SIZES.length - 1);
+  Array.from(listbox.children).forEach((option, index) => option.setAttribute('aria-selected', index === highlighted));
+}
+
+function choose() {
+  pageSize = PAGE_SIZES[highlighted];
+  listbox.remove();
+  listbox = null;
+  setTimeout(() => { page = 1; render(); }, delay());
+}
+
+document.getElementById('page-size').addEventListener('click', (event) => event.target.focus());
+document.getElementById('pagination').addEventListener('click', (event) => {
+  const button = event.target.closest('button');
+  if (button && !button.disabled) go(Number(button.dataset.page));
+});
+document.addEventListener('keydown', (event) => {
+  if (event.key === 'ArrowDown') { event.preventDefault(); openOrMove(); }
+  else if (event.key === 'Enter' && listbox !== null) { event.preventDefault(); choose(); }
+});
+render();
+</script>
+</body>
+</html>
+"""
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{name}</title></head>
+<body>
+<div id="app_top">
+  <header class="MuiPaper-root MuiAppBar-root MuiAppBar-positionSticky MuiAppBar-colorPrimary MuiPaper-elevation4">
+    <div class="MuiToolbar-root">
+      <div class="MuiGrid-root MuiGrid-item MuiGrid-grid-xs-12 MuiGrid-grid-md-6"><h1>{name}</h1><span>District: {district}<br>Grades Served: {grades}</span></div>
+      <div class="MuiGrid-root jss16 MuiGrid-item MuiGrid-grid-xs-12 MuiGrid-grid-md-5"><p><b>ADDRESS:</b><br>{address}</p><p><b>PHONE:</b><br>{phone}</p></div>
+    </div>
+  </header>
+  <div class="MuiContainer-root">
+    <div>
+      <div class="MuiGrid-root MuiGrid-container">
+        <div class="MuiGrid-root jss51 MuiGrid-item MuiGrid-grid-xs-12 MuiGrid-grid-md-7"><div><div class="MuiGrid-root jss52 MuiGrid-item MuiGrid-grid-xs-12 MuiGrid-grid-sm-4"><a href="{website}">Website</a></div></div></div>
+      </div>
+      <div><h2>Performance</h2></div>
+      <div><h2>Programs</h2></div>
+      <div><div class="MuiGrid-root MuiGrid-container"><div><div class="MuiGrid-root MuiGrid-item MuiGrid-grid-xs-12 MuiGrid-grid-sm-12 MuiGrid-grid-md-7"><b>Grades:</b><b>{grades}</b><b>Total Students:</b><b>{total_students}</b></div></div></div></div>
+    </div>
+  </div>
+</div>
+</body>
+</html>
+"""
+
+ERROR_PAGE = "<!DOCTYPE html><html><body><div id=\"app_top\"><h1>Service Unavailable</h1></div></body></html>"
+
+
+class FixtureSchool(NamedTuple):
+    id: str
+    name: str
+    district: str
+    city: str
+    html: str
+
+
+def generate_schools(count: int, seed: int = 0) -> List[FixtureSchool]:
+    """Build 'count' synthetic schools whose detail pages match the selectors of the txschools config."""
+    rng = random.Random(seed)
+    schools = []
+    for index in range(count):
+        city, zip_code = rng.choice(CITIES)
+        school_id = f'{101900000 + index}'
+        name = f'{city.upper()} SCHOOL {index + 1}'
+        district = f'{city} ISD'
+        html = DETAIL_TEMPLATE.format(
+            name=escape(name),
+            district=escape(district),
+            grades=escape(rng.choice(GRADES)),
+            address=escape(f'{rng.randint(100, 9999)} Main St, {city}, TX {zip_code}'),
+            phone=f'({rng.randint(200, 999)}) 555-{rng.randint(0, 9999):04d}',
+            website=f'http://www.{city.lower().replace(" ", "")}isd.example.org/{school_id}',
+            total_students=f'{rng.randint(50, 3500):,}'
+        )
+        schools.append(FixtureSchool(school_id, name, district, city, html))
+    return schools
+
+
+def load_recorded_schools(filename: str, key_param: str = 'id') -> List[FixtureSchool]:
+    """Load the detail pages recorded by the latest capture run (with 'capture.html' enabled) of a capture archive."""
+    store = CaptureStore(filename, key_param=key_param)
+    try:
+        execution_date = store.latest_execution_date()
+        schools = [
+            FixtureSchool(get_query_param(url, key_param) or url, fields.get("school_name") or url, '', '', html)
+            for url, fields, html in store.iter_captures(execution_date) if html is not None
+        ] if execution_date else []
+    finally:
+        store.close()
+    if not schools:
+        raise ValueError(f"No recorded HTML found in the capture archive '{filename}'.")
+    return schools
+
+
+class FixtureSite:
+    """
+    Local replica of the txschools listing and detail pages, served on a background thread for benchmarks.
+
+    The listing is rendered client-side with the same structure as the live site (results-per-page dropdown,
+    ten-item pagination widget), so the scraper runs against it with its configured selectors unchanged.
+    Each ARROW_DOWN / RETURN of the dropdown selects the next of 'page_sizes', starting from the first:
+    the configured 3 key presses select 15 results per page.
+    Every response waits 'latency' seconds plus up to 'jitter' seconds, and a 'failure_rate' fraction of the
+    detail pages fail: 'error' answers 503 with an empty page, 'hang' answers after 'hang_seconds'.
+    """
+
+    def __init__(self, schools: List[FixtureSchool], latency: float = 0, jitter: float = 0, failure_rate: float = 0,
+                 failure_mode: str = ERROR, hang_seconds: float = 30, page_sizes: tuple = (5, 10, 15, 20, 25),
+                 seed: int = 0, host: str = '127.0.0.1', port: int = 0):
+        if failure_mode not in (ERROR, HANG):
+            raise ValueError(f"Unsupported failure mode: '{failure_mode}'")
+        self.schools: Dict[str, FixtureSchool] = {school.id: school for school in schools}
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.hang_seconds = hang_seconds
+        self.stats = {"listing_requests": 0, "detail_requests": 0, "injected_failures": 0, "not_found": 0}
+        self._listing_html = self._render_listing(schools, page_sizes)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def listing_url(self) -> str:
+        return f'{self.url}/?view=schools&lng=en'
+
+    def start(self) -> 'FixtureSite':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fixture-site', daemon=True)
+        self._thread.start()
+        logging.info(f"Fixture site serving {len(self.schools)} schools at {self.listing_url}")
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _render_listing(self, schools: List[FixtureSchool], page_sizes: tuple) -> bytes:
+        rows = [[school.id, escape(school.name), escape(school.district), escape(school.city)] for school in schools]
+        return (LISTING_TEMPLATE
+                .replace('__SCHOOLS__', json.dumps(rows))
+                .replace('__PAGE_SIZES__', json.dumps(list(page_sizes)))
+                .replace('__LATENCY__', json.dumps(self.latency))
+                .replace('__JITTER__', json.dumps(self.jitter))).encode('utf-8')
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def _should_fail(self) -> bool:
+        if not self.failure_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def respond(self, path: str):
+        """Return the status and body of a request path, after the injected latency or failure."""
+        parsed = urlparse(path)
+        if parsed.path != '/':
+            return 404, ERROR_PAGE.encode('utf-8')
+        query = parse_qs(parsed.query)
+        view = query.get('view', ['schools'])[0]
+        time.sleep(self._delay())
+        if view == 'schools':
+            self._count("listing_requests")
+            return 200, self._listing_html
+
+        self._count("detail_requests")
+        school = self.schools.get(query.get('id', [''])[0])
+        if school is None:
+            self._count("not_found")
+            return 404, ERROR_PAGE.encode('utf-8')
+        if self._should_fail():
+            self._count("injected_failures")
+            if self.failure_mode == ERROR:
+                return 503, ERROR_PAGE.encode('utf-8')
+            time.sleep(self.hang_seconds)
+        return 200, school.html.encode('utf-8')
+
+    def _handler_class(self):
+        site = self
+
+        class FixtureRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                try:
+                    status, body = site.respond(self.path)
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return FixtureRequestHandler
@@ -0,0 +1,197 @@
+import re
+import functools
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+BLOCK_ELEMENTS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'section', 'table', 'tbody',
+    'td', 'th', 'thead', 'tr', 'ul'
+}
+SKIPPED_ELEMENTS = {'script', 'style', 'noscript', 'template'}
+
+_COMPOUND_PATTERN = re.compile(r'([a-zA-Z][\w-]*)|#([\w-]+)|\.([\w-]+)|:nth-child\((\d+)\)|\[([\w-]+)(?:="?([^"\]]*)"?)?\]')
+
+
+class HtmlNode:
+    """Element of a parsed HTML document."""
+
+    def __init__(self, tag: str, attrs: dict, parent: Optional['HtmlNode'] = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.element_children = []
+
+    @property
+    def classes(self) -> List[str]:
+        return (self.attrs.get('class') or '').split()
+
+    def get(self, attribute: str) -> Optional[str]:
+        """Return an attribute value, or None if it is not set."""
+        return self.attrs.get(attribute)
+
+    @property
+    def text(self) -> str:
+        """Approximate the rendered text of the element, the way Selenium's '.text' does."""
+        parts = []
+        self._collect_text(parts)
+        lines = [re.sub(r'\s+', ' ', line).strip() for line in ''.join(parts).split('\n')]
+        return '\n'.join(line for line in lines if line)
+
+    def _collect_text(self, parts: list) -> None:
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child.replace('\n', ' '))
+            elif child.tag == 'br':
+                parts.append('\n')
+            elif child.tag not in SKIPPED_ELEMENTS:
+                block = child.tag in BLOCK_ELEMENTS
+                if block:
+                    parts.append('\n')
+                child._collect_text(parts)
+                if block:
+                    parts.append('\n')
+
+    def iter_descendants(self):
+        for child in self.element_children:
+            yield child
+            yield from child.iter_descendants()
+
+
+class HtmlDocument(HTMLParser):
+    """Minimal DOM built with the standard library, queried with a subset of CSS selectors.
+
+    Supported selectors: tag, #id, .class, [attr] / [attr=value] and :nth-child(n),
+    combined with the child ('>') and descendant (' ') combinators.
+    """
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlNode('#document', {})
+        self._current = self.root
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        node = HtmlNode(tag, {name: value or '' for name, value in attrs}, self._current)
+        self._current.children.append(node)
+        self._current.element_children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = HtmlNode(tag, {name: value or '' for name, value in attrs}, self._current)
+        self._current.children.append(node)
+        self._current.element_children.append(node)
+
+    def handle_endtag(self, tag):
+        node = self._current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        self._current.children.append(data)
+
+    def select(self, selector: str) -> List[HtmlNode]:
+        """Return every element matching the CSS selector, in document order."""
+        steps = compile_selector(selector)
+        return [node for node in self.root.iter_descendants() if _matches(node, steps, len(steps) - 1)]
+
+    def select_one(self, selector: str) -> Optional[HtmlNode]:
+        """Return the first element matching the CSS selector, or None."""
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+
+@functools.lru_cache(maxsize=None)
+def compile_selector(selector: str) -> tuple:
+    """
+    Split a selector into (combinator, compound) steps, left to right. Compiled selectors are cached, so each
+    selector is only parsed once per process; raises ValueError for selectors outside the supported subset.
+    """
+    tokens = re.sub(r'\s*>\s*', ' > ', selector.strip()).split()
+    steps = []
+    combinator = ' '
+    for token in tokens:
+        if token == '>':
+            combinator = '>'
+            continue
+        compound = {'tag': None, 'id': None, 'classes': [], 'nth': None, 'attrs': []}
+        position = 0
+        for match in _COMPOUND_PATTERN.finditer(token):
+            if match.start() != position:
+                raise ValueError(f"Unsupported selector: '{selector}'")
+            position = match.end()
+            tag, element_id, class_name, nth, attr_name, attr_value = match.groups()
+            if tag:
+                compound['tag'] = tag.lower()
+            elif element_id:
+                compound['id'] = element_id
+            elif class_name:
+                compound['classes'].append(class_name)
+            elif nth:
+                compound['nth'] = int(nth)
+            else:
+                compound['attrs'].append((attr_name, attr_value))
+        if position != len(token):
+            raise ValueError(f"Unsupported selector: '{selector}'")
+        steps.append((combinator, compound))
+        combinator = ' '
+    return tuple(steps)
+
+
+def _matches_compound(node: HtmlNode, compound: dict) -> bool:
+    if compound['tag'] and node.tag != compound['tag']:
+        return False
+    if compound['id'] and node.attrs.get('id') != compound['id']:
+        return False
+    if compound['classes'] and not set(compound['classes']).issubset(node.classes):
+        return False
+    for name, value in compound['attrs']:
+        if name not in node.attrs or (value is not None and node.attrs[name] != value):
+            return False
+    if compound['nth'] is not None:
+        siblings = node.parent.element_children if node.parent else [node]
+        if siblings.index(node) + 1 != compound['nth']:
+            return False
+    return True
+
+
+def _matches(node: HtmlNode, steps: list, index: int) -> bool:
+    combinator, compound = steps[index]
+    if not _matches_compound(node, compound):
+        return False
+    if index == 0:
+        return True
+    parent = node.parent
+    if combinator == '>':
+        return parent is not None and parent.tag != '#document' and _matches(parent, steps, index - 1)
+    while parent is not None and parent.tag != '#document':
+        if _matches(parent, steps, index - 1):
+            return True
+        parent = parent.parent
+    return False
+
+
+def extract_fields_from_html(html: str, selectors: Dict[str, str], attributes: Optional[Dict[str, str]] = None) -> Dict[str, Optional[str]]:
+    """Extract each field of a selector map from an HTML document. Missing fields are returned as None."""
+    attributes = attributes or {}
+    document = HtmlDocument(html)
+    fields = {}
+    for field, selector in selectors.items():
+        node = document.select_one(selector)
+        if node is None:
+            fields[field] = None
+        elif field in attributes:
+            fields[field] = node.get(attributes[field])
+        else:
+            fields[field] = node.text or None
+    return fields
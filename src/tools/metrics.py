@@ -0,0 +1,196 @@
+import os
+import json
+import time
+import random
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from tools.retry_policy import classify_error
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Histogram:
+    """Latency histogram with fixed bucket bounds, in seconds."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((index for index, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket holding it, capped by the largest value observed."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+
+class MetricsRegistry:
+    """
+    Thread-safe latency histograms, error and retry counters of the phases of a scraper run, with sampled per-URL traces.
+
+    Phases are timed with 'time' (or the 'instrumented' decorator); a phase timed while a sampled trace is active
+    on the same thread is also recorded as a span of that trace.
+    """
+
+    def __init__(self, trace_sample_rate: float = 0):
+        self.trace_sample_rate = trace_sample_rate
+        self.histograms: Dict[str, Histogram] = {}
+        self.errors: Dict[tuple, int] = {}
+        self.counters: Dict[tuple, int] = {}
+        self.traces: List[dict] = []
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._thread_state = threading.local()
+
+    @contextmanager
+    def time(self, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.observe(phase, time.perf_counter() - started, e)
+            raise
+        self.observe(phase, time.perf_counter() - started)
+
+    def observe(self, phase: str, seconds: float, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.histograms.setdefault(phase, Histogram()).observe(seconds)
+            if error is not None:
+                key = (phase, type(error).__name__, classify_error(error))
+                self.errors[key] = self.errors.get(key, 0) + 1
+        trace = getattr(self._thread_state, 'trace', None)
+        if trace is not None:
+            span = {"phase": phase, "offset": round(time.time() - trace["started_at"] - seconds, 4), "duration": round(seconds, 4)}
+            if error is not None:
+                span["error"] = type(error).__name__
+            trace["spans"].append(span)
+
+    def increment(self, name: str, value: int = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    @contextmanager
+    def trace(self, url: str):
+        """Record the phases of a URL as a trace, for a 'trace_sample_rate' fraction of the URLs."""
+        if getattr(self._thread_state, 'trace', None) is not None or random.random() >= self.trace_sample_rate:
+            yield
+            return
+        trace = {"url": url, "started_at": time.time(), "spans": []}
+        self._thread_state.trace = trace
+        try:
+            yield
+        except Exception as e:
+            trace["error"] = type(e).__name__
+            raise
+        finally:
+            self._thread_state.trace = None
+            trace["duration"] = round(time.time() - trace["started_at"], 4)
+            with self._lock:
+                self.traces.append(trace)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration": round(time.time() - self.started_at, 3),
+                "phases": {
+                    phase: {
+                        "count": histogram.count,
+                        "sum": round(histogram.sum, 4),
+                        "max": round(histogram.max, 4),
+                        "p50": histogram.quantile(0.5),
+                        "p95": histogram.quantile(0.95)
+                    }
+                    for phase, histogram in self.histograms.items()
+                },
+                "errors": [{"phase": phase, "error": error, "kind": kind, "count": count} for (phase, error, kind), count in self.errors.items()],
+                "counters": [{"name": name, **dict(labels), "count": count} for (name, labels), count in self.counters.items()]
+            }
+
+    def to_prometheus(self, prefix: str = 'scraper') -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_phase_duration_seconds Duration of the phases of the scraper.",
+            f"# TYPE {prefix}_phase_duration_seconds histogram"
+        ]
+        with self._lock:
+            for phase, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_phase_duration_seconds_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_phase_duration_seconds_sum{{phase="{phase}"}} {histogram.sum:.6f}')
+                lines.append(f'{prefix}_phase_duration_seconds_count{{phase="{phase}"}} {histogram.count}')
+
+            lines += [f"# HELP {prefix}_errors_total Errors raised by the phases of the scraper.", f"# TYPE {prefix}_errors_total counter"]
+            for (phase, error, kind), count in sorted(self.errors.items()):
+                lines.append(f'{prefix}_errors_total{{phase="{phase}",error="{error}",kind="{kind}"}} {count}')
+
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (counter, labels), count in sorted(self.counters.items()):
+                    if counter == name:
+                        rendered = ','.join(f'{label}="{value}"' for label, value in labels)
+                        lines.append(f'{prefix}_{name}{{{rendered}}} {count}' if rendered else f'{prefix}_{name} {count}')
+
+        lines.append(f"{prefix}_run_start_timestamp_seconds {self.started_at:.0f}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, filename: str, format: str = 'prometheus', traces_filename: Optional[str] = None, labels: Optional[dict] = None) -> None:
+        """
+        Write the metrics of the run to '<filename>.prom' or '<filename>.json', replacing the previous run's file
+        atomically, and append the sampled traces to '<traces_filename>.jsonl'.
+        """
+        if format == 'prometheus':
+            path, content = f'{filename}.prom', self.to_prometheus()
+        elif format == 'json':
+            path, content = f'{filename}.json', json.dumps({**(labels or {}), **self.summary()}, indent=2)
+        else:
+            raise ValueError(f"Unsupported metrics format: '{format}'")
+
+        try:
+            with open(f'{path}.tmp', 'w') as file:
+                file.write(content)
+            os.replace(f'{path}.tmp', path)
+            if traces_filename and self.traces:
+                with open(f'{traces_filename}.jsonl', 'a') as file:
+                    for trace in self.traces:
+                        file.write(json.dumps({**(labels or {}), **trace}) + '\n')
+            logging.info(f"Metrics written to '{path}'.")
+        except Exception as e:
+            logging.error(f"Failed to write metrics to '{path}': {e}")
+            raise
+
+
+def instrumented(phase: str):
+    """Time a method as a phase of the registry in the 'metrics' attribute of its instance, when there is one."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, 'metrics', None)
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            with metrics.time(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,97 @@
+import os
+import uuid
+import logging
+import threading
+from urllib.parse import quote
+import pandas as pd
+from typing import Dict, List, Optional, Union
+from tools.storage_backend import StorageBackend, apply_column_types
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+class ParquetHandler(StorageBackend):
+    """
+    Parquet dataset partitioned by execution date, with typed columns.
+
+    Each run is written to its own 'execution_date=...' directory, so readers filtering on the execution date,
+    or selecting a few columns, only read the matching files and column chunks. Requires pyarrow.
+
+    The file of each partition stays open until 'close', and every 'save_data' call adds a row group to it,
+    so a run saved in many small batches still makes a single file.
+    """
+
+    def __init__(self, filename: str, headers: List[str], partition_by: str = 'execution_date', column_types: Optional[Dict[str, str]] = None):
+        if pa is None:
+            raise ImportError("The Parquet storage backend requires pyarrow, from the 'parquet' extra: 'poetry install --extras parquet'.")
+        super().__init__(filename, headers)
+        self.partition_by = partition_by
+        self.column_types = column_types or {}
+        self.path = f'{self.filename}.parquet'
+        self._writers = {}
+        self._lock = threading.Lock()
+
+    def save_data(self, data: Union[pd.DataFrame, List[dict]]) -> None:
+        """Write the provided data as a row group of the open file of each of its execution dates' partitions, closed by 'close'."""
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data, columns=self.headers)
+        if self.partition_by not in data.columns:
+            raise ValueError(f"Missing partition column '{self.partition_by}'.")
+
+        try:
+            data = data.reindex(columns=list(dict.fromkeys(self.headers + list(data.columns))))
+            data = apply_column_types(data, self.column_types)
+            with self._lock:
+                for value, partition in data.groupby(self.partition_by, sort=False):
+                    table = pa.Table.from_pandas(partition.drop(columns=[self.partition_by]), preserve_index=False)
+                    self._write_row_group(str(value), table)
+            logging.info(f"{len(data)} rows written to '{self.path}'.")
+        except Exception as e:
+            logging.error(f"Failed to save data to '{self.path}': {e}")
+            raise
+
+    def _write_row_group(self, value: str, table) -> None:
+        """Add a row group to the open file of a partition, or start a new file if the batch's schema does not fit it."""
+        writer = self._writers.get(value)
+        if writer is not None:
+            try:
+                table = table.cast(writer.schema)
+            except (pa.ArrowInvalid, ValueError):
+                writer.close()
+                writer = None
+        if writer is None:
+            directory = os.path.join(self.path, f'{self.partition_by}={quote(value, safe="")}')
+            os.makedirs(directory, exist_ok=True)
+            writer = pq.ParquetWriter(os.path.join(directory, f'part-{uuid.uuid4().hex}.parquet'), table.schema)
+            self._writers[value] = writer
+        writer.write_table(table)
+
+    def close(self) -> None:
+        """Close the files of the partitions written, which are only readable once closed."""
+        with self._lock:
+            writers, self._writers = self._writers, {}
+        for writer in writers.values():
+            writer.close()
+
+    def read_data(self, where: Optional[dict] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read the dataset, pushing the 'where' equality filters and the column selection down to the files."""
+        if not os.path.exists(self.path):
+            logging.info(f"Parquet dataset '{self.path}' does not exist yet.")
+            return pd.DataFrame(columns=columns or self.headers)
+
+        try:
+            filters = [(column, '==', value) for column, value in where.items()] if where else None
+            df = pd.read_parquet(self.path, engine='pyarrow', columns=columns, filters=filters)
+            if self.partition_by in df.columns:
+                df[self.partition_by] = df[self.partition_by].astype('string')
+            logging.info(f"Data read from '{self.path}'.")
+            return df
+        except Exception as e:
+            logging.error(f"Failed to read data from '{self.path}': {e}")
+            raise
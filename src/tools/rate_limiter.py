@@ -0,0 +1,113 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Dict
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+class TokenBucket:
+    """Asyncio token bucket: 'rate' requests per second on average, with bursts of up to 'capacity' requests."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        if rate <= 0:
+            raise ValueError(f"Invalid rate: '{rate}'")
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it. Waiters are served in order."""
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available, without waiting. Return 0 once taken, otherwise the seconds until the next token."""
+        self._refill()
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        return 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class HostRateLimiter:
+    """One token bucket per host, created on first use."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, host: str) -> None:
+        await self._bucket(host).acquire()
+
+    def try_acquire(self, host: str) -> float:
+        """Take a token of the host without waiting. Not thread-safe: callers on several threads hold a lock of their own."""
+        return self._bucket(host).try_acquire()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.capacity)
+        return self.buckets[host]
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limit on the requests in flight, adjusted to the observed latency and error rate (AIMD).
+
+    After each window of completed requests, the limit grows by one while the error rate and the median latency
+    stay under their targets, and is halved otherwise.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial_limit: int = None, target_latency: float = 5,
+                 max_error_rate: float = 0.2, window: int = 20):
+        if max_limit < 1 or min_limit < 1 or min_limit > max_limit:
+            raise ValueError(f"Invalid concurrency limits: '{min_limit}' to '{max_limit}'")
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = min(max(initial_limit or min_limit, min_limit), max_limit)
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.in_flight = 0
+        self._results = deque(maxlen=window)
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, latency: float, error: bool = False) -> None:
+        """Record the outcome of a request and free its slot."""
+        async with self._condition:
+            self.in_flight -= 1
+            self._results.append((latency, error))
+            if len(self._results) >= self.window:
+                self._adjust()
+            self._condition.notify_all()
+
+    def _adjust(self) -> None:
+        latencies = sorted(latency for latency, _ in self._results)
+        median_latency = latencies[len(latencies) // 2]
+        error_rate = sum(1 for _, error in self._results if error) / len(self._results)
+        self._results.clear()
+
+        previous = self.limit
+        if error_rate > self.max_error_rate or median_latency > self.target_latency:
+            self.limit = max(self.min_limit, self.limit // 2)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+        if self.limit != previous:
+            logging.info(f"Concurrency limit {previous} -> {self.limit} (median latency {median_latency:.2f}s, error rate {error_rate:.0%}).")
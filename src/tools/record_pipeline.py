@@ -0,0 +1,127 @@
+import logging
+import threading
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+import pandas as pd
+from tools.metrics import instrumented
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+class RawRecord(NamedTuple):
+    """Raw field values of a scraped page, in the order of the extraction fields of its config."""
+    key: str
+    url: Optional[str]
+    values: tuple
+    change_type: Optional[str] = None
+
+    def to_dict(self, fields: List[str]) -> dict:
+        return {"School ID": self.key, "URL": self.url, **dict(zip(fields, self.values))}
+
+
+class RecordBatch:
+    """Records flushed together. The execution date is stamped once for the whole batch, when it becomes a DataFrame."""
+
+    __slots__ = ('execution_date', 'records', 'tags')
+
+    def __init__(self, execution_date: str, records: Optional[List[RawRecord]] = None, tags: Optional[list] = None):
+        self.execution_date = execution_date
+        self.records = records if records is not None else []
+        self.tags = tags if tags is not None else []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def to_frame(self, fields: List[str], change_types: bool = False) -> pd.DataFrame:
+        """Build the raw DataFrame of the batch column by column, with the execution date as a single broadcast value."""
+        columns = {"School ID": [record.key for record in self.records], "URL": [record.url for record in self.records]}
+        values = list(zip(*(record.values for record in self.records))) or [()] * len(fields)
+        columns.update({field: list(column) for field, column in zip(fields, values)})
+        if change_types:
+            columns["change_type"] = [record.change_type for record in self.records]
+        columns["execution_date"] = self.execution_date
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(self.records)))
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to 'size' consecutive items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class RecordPipeline:
+    """
+    Bounded-memory path of scraped records to storage: fetch and extract produce RawRecords, which are buffered
+    into batches of 'batch_size', and each batch goes as one DataFrame through the 'stages' (e.g. raw sink,
+    post-processing and processed sink). 'on_flush' receives the tags of a batch once every stage is done.
+
+    Batches are flushed by the thread that fills them, while the other writers wait, so the fetch stage is slowed
+    down to the pace of the sinks instead of the buffer growing: at most one batch is held in memory.
+    """
+
+    def __init__(self, fields: List[str], execution_date: str, stages: List[Callable[[pd.DataFrame], None]], batch_size: int = 50,
+                 change_types: bool = False, on_flush: Optional[Callable[[list], None]] = None, metrics=None):
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: '{batch_size}'")
+        self.fields = fields
+        self.execution_date = execution_date
+        self.stages = stages
+        self.batch_size = batch_size
+        self.change_types = change_types
+        self.on_flush = on_flush
+        self.metrics = metrics
+        self.records_written = 0
+        self.batch = RecordBatch(execution_date)
+        self._lock = threading.Lock()
+
+    def write(self, record: RawRecord, tag=None) -> None:
+        """Buffer a record, flushing the batch once it is full."""
+        with self._lock:
+            self.batch.records.append(record)
+            if tag is not None:
+                self.batch.tags.append(tag)
+            if len(self.batch) >= self.batch_size:
+                self._flush()
+
+    def consume(self, records: Iterable[RawRecord]) -> int:
+        """Pull every record of a generator through the pipeline, and return their number."""
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        self.flush()
+        return count
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    @instrumented("batch_flush")
+    def _flush(self) -> None:
+        if not len(self.batch):
+            return
+        batch, self.batch = self.batch, RecordBatch(self.execution_date)
+        try:
+            raw_df = batch.to_frame(self.fields, self.change_types)
+            for stage in self.stages:
+                stage(raw_df)
+        except Exception as e:
+            logging.error(f"Failed to flush a batch of {len(batch)} records: {e}")
+            raise
+        self.records_written += len(batch)
+        if self.on_flush and batch.tags:
+            self.on_flush(batch.tags)
+
+    def close(self) -> None:
+        self.flush()
+        logging.info(f"{self.records_written} records written.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
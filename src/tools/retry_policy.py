@@ -0,0 +1,64 @@
+import random
+import requests
+from selenium.common.exceptions import (
+    TimeoutException,
+    StaleElementReferenceException,
+    NoSuchWindowException,
+    InvalidSessionIdException,
+    WebDriverException
+)
+
+TRANSIENT = 'transient'
+PERMANENT = 'permanent'
+
+TRANSIENT_EXCEPTIONS = (
+    TimeoutException,
+    StaleElementReferenceException,
+    NoSuchWindowException,
+    InvalidSessionIdException,
+    TimeoutError,
+    ConnectionError,
+    requests.ConnectionError,
+    requests.Timeout
+)
+TRANSIENT_MESSAGES = (
+    'crash',
+    'disconnected',
+    'target closed',
+    'timed out',
+    'timeout',
+    'session deleted',
+    'unable to receive message from renderer'
+)
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+def classify_error(error: BaseException) -> str:
+    """Classify an error, or any error in its cause chain, as transient or permanent."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, TRANSIENT_EXCEPTIONS):
+            return TRANSIENT
+        if isinstance(error, requests.HTTPError) and error.response is not None and error.response.status_code in TRANSIENT_STATUS_CODES:
+            return TRANSIENT
+        if isinstance(error, WebDriverException) and any(message in str(error).lower() for message in TRANSIENT_MESSAGES):
+            return TRANSIENT
+        error = error.__cause__ or error.__context__
+    return PERMANENT
+
+
+class RetryPolicy:
+    """Decides whether a failed URL is retried, and after how long (exponential backoff with full jitter)."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2, max_delay: float = 60):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Return whether a URL that failed on its 'attempt'-th try (starting at 1) should be tried again."""
+        return attempt < self.max_attempts and classify_error(error) == TRANSIENT
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay before the next try of a URL that failed on its 'attempt'-th try."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
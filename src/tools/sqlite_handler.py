@@ -0,0 +1,121 @@
+import sqlite3
+import logging
+import threading
+import pandas as pd
+from typing import Dict, List, Optional, Union
+from tools.storage_backend import StorageBackend, apply_column_types
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SqliteHandler(StorageBackend):
+    """
+    Keyed SQLite store: the latest record of each key, upserted on write, plus the history of every record written.
+
+    Records carrying a 'change_type' of 'delete' remove the key from the latest records. Columns are added as
+    they appear, and the indexed columns (e.g. 'District', 'ZIP Code') can be queried without a full scan.
+    """
+
+    def __init__(self, filename: str, headers: List[str], key_column: str = 'School ID', order_column: str = 'execution_date',
+                 indexed_columns: Optional[List[str]] = None, column_types: Optional[Dict[str, str]] = None):
+        super().__init__(filename, headers)
+        self.key_column = key_column
+        self.order_column = order_column
+        self.indexed_columns = indexed_columns or []
+        self.column_types = column_types or {}
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(f'{self.filename}.db', check_same_thread=False)
+        self.columns = []
+        self._initialize_db()
+
+    def _initialize_db(self) -> None:
+        with self._lock, self.connection:
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS records ({_quote(self.key_column)} TEXT PRIMARY KEY)")
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS history ({_quote(self.key_column)} TEXT NOT NULL)")
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS history_key ON history ({_quote(self.key_column)})")
+            self.columns = [row[1] for row in self.connection.execute("PRAGMA table_info(records)")]
+        self._ensure_columns(self.headers + self.indexed_columns)
+        with self._lock, self.connection:
+            for index, column in enumerate(self.indexed_columns):
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS records_index_{index} ON records ({_quote(column)})")
+
+    def _ensure_columns(self, columns: List[str]) -> None:
+        """Add the columns missing from both tables. Columns have no declared type, so values keep their own."""
+        missing = [column for column in dict.fromkeys(columns) if column not in self.columns]
+        if not missing:
+            return
+        with self._lock, self.connection:
+            for column in missing:
+                self.connection.execute(f"ALTER TABLE records ADD COLUMN {_quote(column)}")
+                self.connection.execute(f"ALTER TABLE history ADD COLUMN {_quote(column)}")
+        self.columns.extend(missing)
+
+    def save_data(self, data: Union[pd.DataFrame, List[dict]]) -> None:
+        """Append the records to the history and upsert them, by key, into the latest records."""
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data, columns=self.headers)
+        if self.key_column not in data.columns:
+            raise ValueError(f"Missing key column '{self.key_column}'.")
+
+        columns = list(data.columns)
+        self._ensure_columns(columns)
+        rows = [tuple(None if pd.isna(value) else value for value in row) for row in data.astype(object).itertuples(index=False)]
+        key_index = columns.index(self.key_column)
+        change_index = columns.index('change_type') if 'change_type' in columns else None
+        upserts = [row for row in rows if change_index is None or row[change_index] != 'delete']
+        deletions = [(row[key_index],) for row in rows if change_index is not None and row[change_index] == 'delete']
+
+        column_list = ', '.join(_quote(column) for column in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f"{_quote(column)} = excluded.{_quote(column)}" for column in columns if column != self.key_column)
+        newer = ''
+        if self.order_column in columns:
+            order = _quote(self.order_column)
+            newer = f" WHERE records.{order} IS NULL OR excluded.{order} >= records.{order}"
+        try:
+            with self._lock, self.connection:
+                self.connection.executemany(f"INSERT INTO history ({column_list}) VALUES ({placeholders})", rows)
+                self.connection.executemany(
+                    f"INSERT INTO records ({column_list}) VALUES ({placeholders}) "
+                    f"ON CONFLICT ({_quote(self.key_column)}) DO UPDATE SET {updates}{newer}",
+                    upserts
+                )
+                self.connection.executemany(f"DELETE FROM records WHERE {_quote(self.key_column)} = ?", deletions)
+            logging.info(f"{len(upserts)} records upserted and {len(deletions)} deleted in '{self.filename}.db'.")
+        except Exception as e:
+            logging.error(f"Failed to save data to '{self.filename}.db': {e}")
+            raise
+
+    def read_data(self, where: Optional[dict] = None, columns: Optional[List[str]] = None, history: bool = False) -> pd.DataFrame:
+        """Read the latest records (or the history) whose columns equal the values of 'where', optionally only some columns."""
+        unknown = [column for column in list(where or {}) + list(columns or []) if column not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {unknown}")
+
+        selected = ', '.join(_quote(column) for column in columns) if columns else '*'
+        query = f"SELECT {selected} FROM {'history' if history else 'records'}"
+        if where:
+            query += " WHERE " + " AND ".join(f"{_quote(column)} = ?" for column in where)
+        query += " ORDER BY rowid"
+        try:
+            with self._lock:
+                df = pd.read_sql_query(query, self.connection, params=list((where or {}).values()))
+            return apply_column_types(df, self.column_types)
+        except Exception as e:
+            logging.error(f"Failed to read data from '{self.filename}.db': {e}")
+            raise
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the latest record of a key, or None."""
+        df = self.read_data(where={self.key_column: key})
+        return df.iloc[0].to_dict() if len(df) else None
+
+    def get_history(self, key: str) -> pd.DataFrame:
+        """Return every record written for a key, oldest first."""
+        return self.read_data(where={self.key_column: key}, history=True)
+
+    def close(self) -> None:
+        self.connection.close()
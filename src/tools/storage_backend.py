@@ -0,0 +1,58 @@
+import pandas as pd
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Union
+
+NUMERIC_TYPE_PREFIXES = ('int', 'Int', 'float', 'Float', 'UInt')
+# Backends keeping the latest record of each key, which apply incremental upserts and deletions in place.
+KEYED_BACKENDS = ('sqlite',)
+
+def apply_column_types(df: pd.DataFrame, column_types: Dict[str, str]) -> pd.DataFrame:
+    """
+    Cast the columns of a DataFrame to the configured pandas dtypes; other text columns become 'string'.
+
+    Numeric columns are parsed leniently (thousands separators removed, unparseable values become NA),
+    so nullable dtypes such as 'Int64' should be preferred.
+    """
+    types = {}
+    for column in df.columns:
+        dtype = column_types.get(column)
+        if dtype is None:
+            if df[column].dtype == object:
+                types[column] = 'string'
+        elif dtype.startswith(NUMERIC_TYPE_PREFIXES):
+            df = df.assign(**{column: pd.to_numeric(df[column].astype('string').str.replace(',', '', regex=False), errors='coerce')})
+            types[column] = dtype
+        else:
+            types[column] = dtype
+    return df.astype(types)
+
+
+class StorageBackend(ABC):
+    """Storage of tabular scraper data, identified by a filename without extension."""
+
+    def __init__(self, filename: str, headers: List[str]):
+        self.filename = filename
+        self.headers = headers
+
+    @abstractmethod
+    def save_data(self, data: Union[pd.DataFrame, List[dict]]) -> None:
+        """Save the provided data, without rewriting the existing rows."""
+
+    @abstractmethod
+    def read_data(self, where: Optional[dict] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read the rows whose columns equal the values of 'where' (all rows by default), optionally only some columns."""
+
+
+def get_storage_backend(backend: str, filename: str, headers: List[str], column_types: Optional[Dict[str, str]] = None,
+                        indexed_columns: Optional[List[str]] = None) -> StorageBackend:
+    """Return the storage backend registered under a name: 'csv', 'parquet' or 'sqlite'."""
+    if backend == 'csv':
+        from tools.csv_handler import CsvHandler
+        return CsvHandler(filename, headers)
+    if backend == 'parquet':
+        from tools.parquet_handler import ParquetHandler
+        return ParquetHandler(filename, headers, column_types=column_types)
+    if backend == 'sqlite':
+        from tools.sqlite_handler import SqliteHandler
+        return SqliteHandler(filename, headers, indexed_columns=indexed_columns, column_types=column_types)
+    raise ValueError(f"Unsupported storage backend: '{backend}'")
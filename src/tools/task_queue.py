@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+from abc import ABC, abstractmethod
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+READY = 'ready'
+LEASED = 'leased'
+DONE = 'done'
+DEAD = 'dead'
+
+def default_worker_id() -> str:
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+class Task(NamedTuple):
+    id: int
+    queue: str
+    key: str
+    payload: dict
+    attempts: int
+    lease_id: str
+
+
+class TaskQueue(ABC):
+    """
+    Named work queues with lease / ack semantics.
+
+    A leased task is invisible to other workers until its visibility timeout expires; a worker that dies without
+    acknowledging its task therefore loses the lease, and the task is handed to another worker.
+    """
+
+    @abstractmethod
+    def enqueue(self, queue: str, tasks: Iterable[Tuple[str, dict]]) -> int:
+        """Add (key, payload) tasks, ignoring keys already in the queue. Return the number of tasks added."""
+
+    @abstractmethod
+    def lease(self, queue: str, worker_id: str, visibility_timeout: float) -> Optional[Task]:
+        """Lease the next available task, or return None."""
+
+    @abstractmethod
+    def extend(self, task: Task, visibility_timeout: float) -> bool:
+        """Extend the lease of a long-running task. Return False if the lease was lost."""
+
+    @abstractmethod
+    def ack(self, task: Task) -> bool:
+        """Mark a leased task as done. Return False if the lease was lost."""
+
+    @abstractmethod
+    def nack(self, task: Task, error: str, delay: float = 0) -> bool:
+        """Release a leased task to be retried after 'delay' seconds, or as dead once it used all its attempts."""
+
+    @abstractmethod
+    def fail(self, task: Task, error: str) -> bool:
+        """Mark a leased task as dead, without retrying it."""
+
+    @abstractmethod
+    def has_work(self, queues: List[str]) -> bool:
+        """Return whether any of the queues still has tasks ready or leased."""
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteTaskQueue(TaskQueue):
+    """Task queue in a SQLite file, shared by the worker processes of one machine (or of a shared volume)."""
+
+    def __init__(self, filename: str, max_attempts: int = 3):
+        self.filename = filename
+        self.max_attempts = max_attempts
+        self.connection = sqlite3.connect(f'{self.filename}.db', timeout=30, isolation_level=None)
+        self._initialize_db()
+
+    def _initialize_db(self) -> None:
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_id TEXT,
+                leased_by TEXT,
+                lease_expires_at REAL,
+                error TEXT,
+                updated_at REAL,
+                UNIQUE (queue, key)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_available ON tasks (queue, status, available_at);
+        """)
+
+    def enqueue(self, queue: str, tasks: Iterable[Tuple[str, dict]]) -> int:
+        now = time.time()
+        rows = [(queue, key, json.dumps(payload), READY, now, now) for key, payload in tasks]
+        with self._transaction():
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO tasks (queue, key, payload, status, available_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return self.connection.total_changes - before
+
+    def lease(self, queue: str, worker_id: str, visibility_timeout: float) -> Optional[Task]:
+        """Lease the oldest ready task, or a task whose lease expired because its worker died."""
+        now = time.time()
+        lease_id = uuid.uuid4().hex
+        with self._transaction():
+            while True:
+                row = self.connection.execute(
+                    """SELECT id, key, payload, attempts FROM tasks
+                       WHERE queue = ? AND ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at <= ?))
+                       ORDER BY available_at, id LIMIT 1""",
+                    (queue, READY, now, LEASED, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                task_id, key, payload, attempts = row
+                if attempts < self.max_attempts:
+                    break
+                # Every attempt was leased by a worker that died: give up on the task.
+                logging.error(f"Task '{key}' of queue '{queue}' is dead after {attempts} expired leases.")
+                self.connection.execute(
+                    "UPDATE tasks SET status = ?, lease_id = NULL, error = ?, updated_at = ? WHERE id = ?",
+                    (DEAD, 'Lease expired', now, task_id)
+                )
+            self.connection.execute(
+                "UPDATE tasks SET status = ?, attempts = ?, lease_id = ?, leased_by = ?, lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (LEASED, attempts + 1, lease_id, worker_id, now + visibility_timeout, now, task_id)
+            )
+        return Task(task_id, queue, key, json.loads(payload), attempts + 1, lease_id)
+
+    def extend(self, task: Task, visibility_timeout: float) -> bool:
+        now = time.time()
+        return self._update_leased(task, "lease_expires_at = ?, updated_at = ?", (now + visibility_timeout, now))
+
+    def ack(self, task: Task) -> bool:
+        return self._update_leased(task, "status = ?, lease_id = NULL, updated_at = ?", (DONE, time.time()))
+
+    def nack(self, task: Task, error: str, delay: float = 0) -> bool:
+        if task.attempts >= self.max_attempts:
+            return self.fail(task, error)
+        now = time.time()
+        return self._update_leased(task, "status = ?, available_at = ?, lease_id = NULL, error = ?, updated_at = ?", (READY, now + delay, error, now))
+
+    def fail(self, task: Task, error: str) -> bool:
+        logging.error(f"Task '{task.key}' of queue '{task.queue}' is dead after {task.attempts} attempts: {error}")
+        return self._update_leased(task, "status = ?, lease_id = NULL, error = ?, updated_at = ?", (DEAD, error, time.time()))
+
+    def has_work(self, queues: List[str]) -> bool:
+        placeholders = ', '.join('?' for _ in queues)
+        row = self.connection.execute(
+            f"SELECT 1 FROM tasks WHERE queue IN ({placeholders}) AND status IN (?, ?) LIMIT 1",
+            (*queues, READY, LEASED)
+        ).fetchone()
+        return row is not None
+
+    def counts(self, queue: str) -> dict:
+        return dict(self.connection.execute("SELECT status, COUNT(*) FROM tasks WHERE queue = ? GROUP BY status", (queue,)).fetchall())
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _update_leased(self, task: Task, assignments: str, values: tuple) -> bool:
+        """Update a task only while it is still leased with the same lease, so a reclaimed task is never acknowledged twice."""
+        with self._transaction():
+            cursor = self.connection.execute(
+                f"UPDATE tasks SET {assignments} WHERE id = ? AND status = ? AND lease_id = ?",
+                (*values, task.id, LEASED, task.lease_id)
+            )
+        if cursor.rowcount == 0:
+            logging.warning(f"Lease of task '{task.key}' of queue '{task.queue}' was lost.")
+            return False
+        return True
+
+    def _transaction(self):
+        return _ImmediateTransaction(self.connection)
+
+
+class _ImmediateTransaction:
+    """Write transaction taking the database lock up front, so concurrent workers never lease the same task."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def get_task_queue(backend: str, filename: str, max_attempts: int = 3) -> TaskQueue:
+    """Return the task queue registered under a name. Only 'sqlite' is available; a networked backend (e.g. Redis) can be added here."""
+    if backend == 'sqlite':
+        return SqliteTaskQueue(filename, max_attempts=max_attempts)
+    raise ValueError(f"Unsupported task queue backend: '{backend}'")
@@ -0,0 +1,7 @@
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+def get_query_param(url: str, name: str) -> Optional[str]:
+    """Return the first value of a query parameter of a URL, or None if it is not present."""
+    values = parse_qs(urlparse(url).query).get(name)
+    return values[0] if values else None
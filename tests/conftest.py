@@ -0,0 +1,57 @@
+import pytest
+from browser.scrapers.scraper_config import load_config
+from browser.txschools_scraper import TXSchoolsScraper
+from tools.fixture_site import FixtureSite, generate_schools
+
+
+@pytest.fixture
+def configs():
+    return load_config("txschools")
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """TXSchoolsScraper writing its files to a temporary directory. No browser is launched until one is used."""
+    monkeypatch.chdir(tmp_path)
+    scraper = TXSchoolsScraper()
+    yield scraper
+    scraper.checkpoint.close()
+
+
+class FakeSession:
+    def __init__(self, port, name):
+        self.port = port
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSessionManager:
+    """Stands in for BrowserSessionManager, handing out sessions that never launch a browser."""
+
+    def __init__(self):
+        self.sessions = []
+
+    def create_session(self, port, name):
+        session = FakeSession(port, name)
+        self.sessions.append(session)
+        return session
+
+
+@pytest.fixture
+def session_manager():
+    return FakeSessionManager()
+
+
+@pytest.fixture
+def schools():
+    return generate_schools(3, seed=1)
+
+
+@pytest.fixture
+def site(schools):
+    with FixtureSite(schools) as site:
+        yield site
+
@@ -0,0 +1,89 @@
+import threading
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from browser.provider.browser_pool import BrowserPool
+from browser.provider.browser_session import BrowserCrashedError
+from tools.retry_policy import RetryPolicy
+
+URLS = [f"https://txschools.gov/?view=school&id={school_id}" for school_id in range(10)]
+
+
+def run_pool(pool, handler, urls, **kwargs):
+    pool.start(handler, **kwargs)
+    for url in urls:
+        pool.submit(url)
+    return pool.join()
+
+
+def test_invalid_number_of_workers(session_manager):
+    with pytest.raises(ValueError):
+        BrowserPool(0, session_manager)
+
+
+def test_every_url_is_processed_once_across_the_workers(session_manager):
+    processed = []
+    lock = threading.Lock()
+
+    def handler(session, url):
+        with lock:
+            processed.append((session.name, url))
+
+    pool = BrowserPool(3, session_manager, base_port=9300)
+
+    assert run_pool(pool, handler, URLS) == []
+    assert sorted(url for _, url in processed) == sorted(URLS)
+    assert [session.port for session in session_manager.sessions] == [9300, 9301, 9302]
+    assert all(session.closed for session in session_manager.sessions)
+
+
+def test_crashed_urls_are_requeued_a_limited_number_of_times(session_manager):
+    attempts = []
+
+    def handler(session, url):
+        attempts.append(url)
+        if url == URLS[0] or len(attempts) == 2:
+            raise BrowserCrashedError("renderer crashed")
+
+    pool = BrowserPool(1, session_manager, max_crash_requeues=2)
+
+    assert run_pool(pool, handler, URLS[:2]) == URLS[:1]
+    assert attempts.count(URLS[0]) == 3
+    assert attempts.count(URLS[1]) == 2
+
+
+def test_transient_errors_are_retried_and_permanent_errors_reported(session_manager):
+    attempts = []
+    failures = []
+
+    def handler(session, url):
+        attempts.append(url)
+        if url == URLS[0] and attempts.count(url) == 1:
+            raise TimeoutException()
+        if url == URLS[1]:
+            raise NoSuchElementException()
+
+    pool = BrowserPool(2, session_manager)
+    failed = run_pool(pool, handler, URLS[:2], retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01),
+                      on_failure=lambda url, error: failures.append((url, type(error))))
+
+    assert failed == URLS[1:2]
+    assert failures == [(URLS[1], NoSuchElementException)]
+    assert attempts.count(URLS[0]) == 2 and attempts.count(URLS[1]) == 1
+
+
+def test_wait_for_capacity_blocks_until_urls_are_processed(session_manager):
+    release = threading.Event()
+    pool = BrowserPool(1, session_manager)
+    pool.start(lambda session, url: release.wait(5))
+    pool.submit(URLS[0])
+    pool.submit(URLS[1])
+
+    waiter = threading.Thread(target=pool.wait_for_capacity, args=(2,))
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()
+
+    release.set()
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert pool.join() == []
@@ -0,0 +1,61 @@
+import pytest
+from tools.checkpoint_store import CheckpointStore, PENDING, DONE, FAILED
+
+URLS = [f"https://txschools.gov/?view=school&id={school_id}" for school_id in ("1", "2", "3")]
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    checkpoint = CheckpointStore(str(tmp_path / "checkpoint"))
+    yield checkpoint
+    checkpoint.close()
+
+
+def test_enumerated_page_returns_only_urls_still_pending(checkpoint):
+    assert checkpoint.mark_page_enumerated(1, URLS) == URLS
+    checkpoint.mark_done(URLS[:1])
+    checkpoint.mark_failed(URLS[1], "TimeoutException")
+
+    # Enumerating the page again, as a resumed run does, does not bring finished URLs back.
+    assert checkpoint.mark_page_enumerated(1, URLS) == URLS[2:]
+    assert checkpoint.enumerated_pages() == {1}
+    assert checkpoint.status_counts() == {PENDING: 1, DONE: 1, FAILED: 1}
+
+
+def test_urls_are_keyed_by_school_id(checkpoint):
+    checkpoint.mark_page_enumerated(1, URLS)
+    checkpoint.mark_done([URLS[0] + "&ref=listing"])
+
+    assert checkpoint.key(URLS[0]) == "1"
+    assert checkpoint.key("https://txschools.gov/") == "https://txschools.gov/"
+    assert checkpoint.pending_urls() == URLS[1:]
+    assert checkpoint.urls_with_status(DONE) == URLS[:1]
+
+
+def test_checkpoint_survives_reopening(tmp_path, checkpoint):
+    checkpoint.set_meta("execution_date", "2024-08-01T10:00:00")
+    checkpoint.mark_page_enumerated(1, URLS)
+    checkpoint.mark_done(URLS[:2])
+    checkpoint.close()
+
+    reopened = CheckpointStore(str(tmp_path / "checkpoint"))
+
+    assert reopened.get_meta("execution_date") == "2024-08-01T10:00:00"
+    assert reopened.pending_urls() == URLS[2:]
+    reopened.reset()
+    assert reopened.get_meta("execution_date") is None and reopened.status_counts() == {}
+    reopened.close()
+
+
+def test_resumed_run_keeps_its_execution_date_and_failed_urls(scraper):
+    execution_date = scraper._start_checkpoint()
+    scraper.checkpoint.mark_page_enumerated(1, URLS)
+    scraper.checkpoint.mark_failed(URLS[0], "WebDriverException")
+
+    scraper.resume = True
+    assert scraper._start_checkpoint() == execution_date
+    assert scraper.failed_urls == URLS[:1]
+
+    scraper.resume = False
+    assert scraper._start_checkpoint() != execution_date
+    assert scraper.checkpoint.status_counts() == {}
@@ -0,0 +1,123 @@
+import time
+import asyncio
+import threading
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from browser.provider.browser_session import BrowserCrashedError
+from browser.provider.crawl_orchestrator import CrawlOrchestrator
+from tools.rate_limiter import TokenBucket, AdaptiveConcurrencyLimiter
+from tools.retry_policy import RetryPolicy
+
+RATE_LIMIT = {"requests_per_second": 1000, "burst": 1000}
+
+
+def page_urls(pages, per_page):
+    return [[f"https://txschools.gov/?view=school&id={page}-{index}" for index in range(per_page)] for page in range(pages)]
+
+
+def test_every_url_is_processed_and_sessions_closed(session_manager):
+    processed = []
+    lock = threading.Lock()
+
+    def handler(session, url):
+        with lock:
+            processed.append(url)
+
+    pages = page_urls(3, 4)
+    orchestrator = CrawlOrchestrator(2, session_manager, rate_limit=RATE_LIMIT)
+
+    assert orchestrator.run(pages, handler) == []
+    assert sorted(processed) == sorted(url for urls in pages for url in urls)
+    assert len(session_manager.sessions) == 2
+    assert all(session.closed for session in session_manager.sessions)
+
+
+def test_listing_pages_are_read_only_while_few_urls_are_pending(session_manager):
+    max_seen = 0
+    scheduled = 0
+    done = 0
+    lock = threading.Lock()
+
+    def pages():
+        nonlocal scheduled, max_seen
+        for urls in page_urls(5, 3):
+            with lock:
+                max_seen = max(max_seen, scheduled - done)
+                scheduled += len(urls)
+            yield urls
+
+    def handler(session, url):
+        nonlocal done
+        time.sleep(0.01)
+        with lock:
+            done += 1
+
+    orchestrator = CrawlOrchestrator(2, session_manager, rate_limit=RATE_LIMIT, max_pending=3)
+
+    assert orchestrator.run(pages(), handler) == []
+    assert done == 15
+    assert max_seen < 3
+
+
+def test_failures_are_retried_requeued_or_reported(session_manager):
+    attempts = []
+    failures = []
+    urls = page_urls(1, 3)[0]
+
+    def handler(session, url):
+        attempts.append(url)
+        if url == urls[0] and attempts.count(url) == 1:
+            raise TimeoutException()
+        if url == urls[1]:
+            raise BrowserCrashedError("renderer crashed")
+        if url == urls[2]:
+            raise NoSuchElementException()
+
+    orchestrator = CrawlOrchestrator(1, session_manager, rate_limit=RATE_LIMIT, max_crash_requeues=1)
+    failed = orchestrator.run([urls], handler, retry_policy=RetryPolicy(base_delay=0.01),
+                              on_failure=lambda url, error: failures.append(url))
+
+    assert sorted(failed) == sorted(urls[1:])
+    assert sorted(failures) == sorted(urls[1:])
+    assert attempts.count(urls[0]) == 2 and attempts.count(urls[1]) == 2 and attempts.count(urls[2]) == 1
+
+
+def test_requests_to_a_host_are_rate_limited(session_manager):
+    orchestrator = CrawlOrchestrator(4, session_manager, rate_limit={"requests_per_second": 20, "burst": 1})
+
+    started = time.monotonic()
+    orchestrator.run(page_urls(1, 6), lambda session, url: None)
+
+    # The first request takes the initial token, the five others wait 1/20s each.
+    assert time.monotonic() - started >= 0.2
+
+
+def test_token_bucket_allows_bursts_then_paces():
+    async def take(bucket, count):
+        started = time.monotonic()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(take(TokenBucket(10, capacity=3), 3)) < 0.05
+    assert asyncio.run(take(TokenBucket(10, capacity=3), 5)) >= 0.15
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_concurrency_limit_grows_while_healthy_and_halves_under_stress():
+    async def complete(limiter, count, latency, error=False):
+        for _ in range(count):
+            await limiter.acquire()
+            await limiter.release(latency, error)
+        return limiter.limit
+
+    async def run():
+        limiter = AdaptiveConcurrencyLimiter(max_limit=4, min_limit=1, target_latency=1, window=2)
+        return [
+            await complete(limiter, 6, latency=0.1),
+            await complete(limiter, 2, latency=0.1, error=True),
+            await complete(limiter, 4, latency=2)
+        ]
+
+    assert asyncio.run(run()) == [4, 2, 1]
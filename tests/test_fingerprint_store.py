@@ -0,0 +1,90 @@
+import pytest
+from browser.txschools_scraper import TXSchoolsScraper
+from tools.checkpoint_store import DONE
+from tools.fingerprint_store import FingerprintStore, fingerprint
+from tools.record_pipeline import RawRecord
+
+URL = "https://txschools.gov/?view=school&id=1"
+
+
+class RecordingPipeline:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record, tag=None):
+        self.records.append(record)
+
+
+@pytest.fixture
+def fingerprints(tmp_path):
+    fingerprints = FingerprintStore(str(tmp_path / "fingerprints"))
+    yield fingerprints
+    fingerprints.close()
+
+
+@pytest.fixture
+def incremental_scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scraper = TXSchoolsScraper(incremental=True)
+    scraper.execution_date = "2024-08-01T10:00:00"
+    scraper.pipeline = RecordingPipeline()
+    yield scraper
+    scraper.checkpoint.close()
+    scraper.fingerprints.close()
+
+
+def record(name):
+    return RawRecord("1", URL, (name,) + (None,) * 5)
+
+
+def test_fingerprint_is_stable_across_key_order():
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+    assert fingerprint("row") == fingerprint("row")
+
+
+def test_upsert_updates_only_the_given_columns(fingerprints):
+    fingerprints.upsert("1", url=URL, listing_hash="l1", content_hash="c1")
+    fingerprints.upsert("1", content_hash="c2")
+
+    row = fingerprints.get("1")
+    assert (row["url"], row["listing_hash"], row["content_hash"]) == (URL, "l1", "c2")
+    assert fingerprints.get("2") is None
+
+
+def test_schools_missing_from_the_listing_are_unseen(fingerprints):
+    fingerprints.upsert("1", url=URL)
+    fingerprints.upsert("2", url=URL)
+    fingerprints.mark_seen(["1"], "2024-08-01T10:00:00")
+
+    assert fingerprints.unseen_since("2024-08-01T10:00:00") == ["2"]
+    fingerprints.delete(["2"])
+    assert fingerprints.unseen_since("2024-08-01T10:00:00") == []
+
+
+def test_only_changed_records_are_written(incremental_scraper):
+    scraper = incremental_scraper
+    scraper._write_record(URL, record("School"))
+    assert [written.change_type for written in scraper.pipeline.records] == ["upsert"]
+    # The fingerprint is committed once the row is on disk.
+    assert scraper.fingerprints.get("1") is None
+    scraper._on_rows_flushed([URL])
+    assert scraper.fingerprints.get("1")["content_hash"] == fingerprint(record("School").to_dict(scraper.configs["extraction"]["fields"]))
+
+    scraper._write_record(URL, record("School"))
+    assert len(scraper.pipeline.records) == 1
+    assert scraper.checkpoint.urls_with_status(DONE) == [URL]
+
+    scraper._write_record(URL, record("Renamed School"))
+    assert len(scraper.pipeline.records) == 2
+
+
+def test_unchanged_listing_rows_are_scraped_unless_configured(incremental_scraper):
+    scraper = incremental_scraper
+    scraper.fingerprints.upsert("1", url=URL, listing_hash=fingerprint("row"))
+
+    assert scraper._skip_unchanged_listings([URL], {URL: "row"}) == [URL]
+
+    scraper.configs["incremental"]["skip_unchanged_listing"] = True
+    assert scraper._skip_unchanged_listings([URL], {URL: "row"}) == []
+    assert scraper._skip_unchanged_listings([URL], {URL: "changed row"}) == [URL]
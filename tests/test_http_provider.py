@@ -0,0 +1,78 @@
+import pytest
+import requests
+from browser.provider.http_provider import HttpProvider
+from tools.fixture_site import FixtureSite
+from tools.html_parser import compile_selector, extract_fields_from_html
+
+
+def detail_url(site, school):
+    return f'{site.url}/?view=school&id={school.id}&lng=en'
+
+
+@pytest.fixture
+def provider():
+    provider = HttpProvider(pool_size=2, timeout=5, retries=0)
+    yield provider
+    provider.close()
+
+
+def test_html_parser_extracts_the_configured_fields(scraper, configs, schools):
+    fields = extract_fields_from_html(schools[0].html, scraper.detail_selectors, configs["extraction"]["attributes"])
+
+    assert fields["school_name"] == schools[0].name
+    assert fields["district_and_grades_served"].startswith(f"District: {schools[0].district}")
+    assert fields["address"].startswith("ADDRESS:")
+    assert fields["phone"].startswith("PHONE:")
+    assert fields["website"].endswith(f"/{schools[0].id}")
+    assert fields["total_students"].replace(",", "").isdigit()
+
+
+def test_html_parser_reports_missing_fields_as_none():
+    fields = extract_fields_from_html("<html><body><h1>Name</h1></body></html>", {"name": "body > h1", "phone": "p:nth-child(2)"})
+
+    assert fields == {"name": "Name", "phone": None}
+
+
+def test_compile_selector_rejects_unsupported_selectors():
+    with pytest.raises(ValueError):
+        compile_selector("a:hover")
+
+
+def test_http_provider_extracts_fields_from_the_fixture_site(provider, scraper, configs, site, schools):
+    for school in schools:
+        fields = provider.extract_fields(detail_url(site, school), scraper.detail_selectors, attributes=configs["extraction"]["attributes"])
+
+        assert fields == extract_fields_from_html(school.html, scraper.detail_selectors, configs["extraction"]["attributes"])
+    assert site.stats["detail_requests"] == len(schools)
+
+
+def test_http_provider_raises_for_missing_fields(provider, scraper, site, schools):
+    # Unknown schools are answered with an error page without the detail fields.
+    with pytest.raises(requests.HTTPError):
+        provider.extract_fields(f'{site.url}/?view=school&id=unknown', scraper.detail_selectors)
+    with pytest.raises(ValueError, match="Missing fields"):
+        provider.extract_fields(detail_url(site, schools[0]), {**scraper.detail_selectors, "extra": "#missing"})
+
+
+def test_http_provider_retries_injected_failures(scraper, schools):
+    provider = HttpProvider(timeout=5, retries=1)
+    with FixtureSite(schools, failure_rate=1) as site:
+        with pytest.raises(requests.exceptions.RetryError):
+            provider.extract_fields(detail_url(site, schools[0]), scraper.detail_selectors)
+    provider.close()
+
+    assert site.stats["injected_failures"] == 2
+
+
+def test_http_engine_captures_the_served_html(provider, scraper, site, schools):
+    scraper.execution_date = "2024-08-01T10:00:00"
+    scraper.http_provider = provider
+    scraper.capture_store = scraper._get_capture_store()
+    scraper.configs["capture"]["html"] = True
+
+    fields = scraper._fetch_fields_with_http(detail_url(site, schools[0]))
+
+    [(url, captured_fields, html)] = scraper.capture_store.iter_captures(scraper.execution_date)
+    scraper.capture_store.close()
+    assert captured_fields == fields
+    assert scraper._extract_fields_from_capture(html) == fields
@@ -0,0 +1,87 @@
+import json
+import pytest
+from selenium.common.exceptions import TimeoutException
+from tools.metrics import Histogram, MetricsRegistry, instrumented
+
+
+class Page:
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    @instrumented("page_load")
+    def load(self, fail=False):
+        if fail:
+            raise TimeoutException()
+        return "loaded"
+
+
+def test_histogram_quantiles_are_bucket_bounds_capped_by_the_max():
+    histogram = Histogram(buckets=(0.1, 1, 10))
+    for value in (0.05, 0.05, 0.5, 3):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1, 0]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.95) == 3
+    assert Histogram().quantile(0.5) is None
+
+
+def test_instrumented_phases_record_latencies_and_classified_errors():
+    metrics = MetricsRegistry()
+    page = Page(metrics)
+
+    assert page.load() == "loaded"
+    with pytest.raises(TimeoutException):
+        page.load(fail=True)
+    assert Page(None).load() == "loaded"
+
+    summary = metrics.summary()
+    assert summary["phases"]["page_load"]["count"] == 2
+    assert summary["errors"] == [{"phase": "page_load", "error": "TimeoutException", "kind": "transient", "count": 1}]
+
+
+def test_sampled_traces_collect_the_spans_of_a_url():
+    metrics = MetricsRegistry(trace_sample_rate=1)
+    with metrics.trace("https://txschools.gov/?id=1"):
+        with metrics.time("navigation"):
+            pass
+        with metrics.time("extraction"):
+            pass
+
+    assert [span["phase"] for span in metrics.traces[0]["spans"]] == ["navigation", "extraction"]
+
+    unsampled = MetricsRegistry(trace_sample_rate=0)
+    with unsampled.trace("https://txschools.gov/?id=1"):
+        with unsampled.time("navigation"):
+            pass
+    assert unsampled.traces == [] and unsampled.summary()["phases"]["navigation"]["count"] == 1
+
+
+def test_prometheus_export_replaces_the_previous_file(tmp_path):
+    metrics = MetricsRegistry(trace_sample_rate=1)
+    metrics.observe("navigation", 0.2)
+    metrics.increment("retries_total", reason="transient")
+    with metrics.trace("https://txschools.gov/?id=1"):
+        pass
+
+    metrics.export(str(tmp_path / "metrics"), traces_filename=str(tmp_path / "traces"))
+    metrics.export(str(tmp_path / "metrics"), traces_filename=str(tmp_path / "traces"))
+
+    content = (tmp_path / "metrics.prom").read_text()
+    assert 'scraper_phase_duration_seconds_bucket{phase="navigation",le="0.25"} 1' in content
+    assert 'scraper_phase_duration_seconds_count{phase="navigation"} 1' in content
+    assert 'scraper_retries_total{reason="transient"} 1' in content
+    assert not (tmp_path / "metrics.prom.tmp").exists()
+    assert len((tmp_path / "traces.jsonl").read_text().splitlines()) == 2
+
+
+def test_json_export_carries_the_labels(tmp_path):
+    metrics = MetricsRegistry()
+    metrics.observe("navigation", 0.2)
+
+    metrics.export(str(tmp_path / "metrics"), format="json", labels={"site": "txschools"})
+
+    summary = json.loads((tmp_path / "metrics.json").read_text())
+    assert summary["site"] == "txschools" and summary["phases"]["navigation"]["count"] == 1
+    with pytest.raises(ValueError):
+        metrics.export(str(tmp_path / "metrics"), format="csv")
@@ -0,0 +1,62 @@
+import os
+import pytest
+import pandas as pd
+from tools.storage_backend import get_storage_backend, apply_column_types
+
+pytest.importorskip("pyarrow")
+
+HEADERS = ["School ID", "Company", "Enrollment", "execution_date"]
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    dataset = get_storage_backend("parquet", str(tmp_path / "schools"), HEADERS, column_types={"Enrollment": "Int64"})
+    yield dataset
+    dataset.close()
+
+
+def rows(execution_date, *school_ids):
+    return pd.DataFrame({
+        "School ID": list(school_ids),
+        "Company": [f"School {school_id}" for school_id in school_ids],
+        "Enrollment": ["1,204"] * len(school_ids),
+        "execution_date": [execution_date] * len(school_ids)
+    })
+
+
+def test_batches_of_a_run_share_one_file_per_partition(dataset):
+    dataset.save_data(rows("2024-08-01T10:00:00", "1", "2"))
+    dataset.save_data(rows("2024-08-01T10:00:00", "3"))
+    dataset.save_data(rows("2024-09-01T10:00:00", "1"))
+    dataset.close()
+
+    partitions = sorted(os.listdir(dataset.path))
+    assert partitions == ["execution_date=2024-08-01T10%3A00%3A00", "execution_date=2024-09-01T10%3A00%3A00"]
+    assert all(len(os.listdir(os.path.join(dataset.path, partition))) == 1 for partition in partitions)
+
+    df = dataset.read_data()
+    assert sorted(df["School ID"]) == ["1", "1", "2", "3"]
+    assert str(df["Enrollment"].dtype) == "Int64" and df["Enrollment"].iloc[0] == 1204
+
+
+def test_filters_and_columns_are_pushed_down(dataset):
+    dataset.save_data(rows("2024-08-01T10:00:00", "1", "2"))
+    dataset.save_data(rows("2024-09-01T10:00:00", "1"))
+    dataset.close()
+
+    df = dataset.read_data(where={"execution_date": "2024-09-01T10:00:00"}, columns=["School ID", "Company"])
+
+    assert df.to_dict("records") == [{"School ID": "1", "Company": "School 1"}]
+
+
+def test_missing_dataset_reads_as_empty(dataset):
+    assert dataset.read_data().columns.tolist() == HEADERS
+    with pytest.raises(ValueError):
+        dataset.save_data(rows("2024-08-01T10:00:00", "1").drop(columns=["execution_date"]))
+
+
+def test_column_types_parse_numbers_leniently():
+    df = apply_column_types(pd.DataFrame({"Enrollment": ["1,204", "n/a"], "Company": ["A", None]}), {"Enrollment": "Int64"})
+
+    assert df["Enrollment"].tolist()[0] == 1204 and pd.isna(df["Enrollment"].iloc[1])
+    assert str(df["Company"].dtype) == "string"
@@ -0,0 +1,97 @@
+import threading
+import pandas as pd
+import pytest
+from tools.csv_handler import CsvStreamWriter
+from tools.record_pipeline import RawRecord, RecordBatch, RecordPipeline, batched
+
+FIELDS = ["name", "phone"]
+
+
+def records(count, start=0):
+    return [RawRecord(f"0{index}", f"url-{index}", (f"School {index}", None)) for index in range(start, start + count)]
+
+
+def test_batched_yields_bounded_lists():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
+
+
+def test_record_batch_to_frame():
+    df = RecordBatch("2024-08-01", records(2)).to_frame(FIELDS)
+
+    assert df.columns.tolist() == ["School ID", "URL", "name", "phone", "execution_date"]
+    assert df["School ID"].tolist() == ["00", "01"]
+    assert df["execution_date"].tolist() == ["2024-08-01"] * 2
+
+
+def test_empty_record_batch_keeps_its_columns():
+    df = RecordBatch("2024-08-01").to_frame(FIELDS, change_types=True)
+
+    assert df.columns.tolist() == ["School ID", "URL", "name", "phone", "change_type", "execution_date"]
+    assert df.empty
+
+
+def test_raw_record_to_dict():
+    assert RawRecord("1", "url", ("A", None)).to_dict(FIELDS) == {"School ID": "1", "URL": "url", "name": "A", "phone": None}
+
+
+def test_pipeline_flushes_full_batches_through_every_stage():
+    frames, flushed = [], []
+    pipeline = RecordPipeline(FIELDS, "2024-08-01", [frames.append, lambda df: frames.append(len(df))], batch_size=2, on_flush=flushed.append)
+
+    for record in records(5):
+        pipeline.write(record, tag=record.url)
+    assert [len(frame) for frame in frames[::2]] == [2, 2]
+    assert frames[1::2] == [2, 2]
+
+    pipeline.close()
+    assert flushed == [["url-0", "url-1"], ["url-2", "url-3"], ["url-4"]]
+    assert pipeline.records_written == 5
+
+
+def test_pipeline_consume_counts_the_records():
+    frames = []
+    pipeline = RecordPipeline(FIELDS, "2024-08-01", [frames.append], batch_size=3)
+
+    assert pipeline.consume(iter(records(7))) == 7
+    assert [len(frame) for frame in frames] == [3, 3, 1]
+
+
+def test_failed_stage_does_not_report_the_batch():
+    flushed = []
+
+    def failing_stage(df):
+        raise OSError("disk full")
+
+    pipeline = RecordPipeline(FIELDS, "2024-08-01", [failing_stage], batch_size=1, on_flush=flushed.append)
+    with pytest.raises(OSError):
+        pipeline.write(records(1)[0], tag="url-0")
+
+    assert flushed == []
+    assert pipeline.records_written == 0
+
+
+def test_concurrent_writers_never_exceed_one_batch():
+    sizes = []
+    pipeline = RecordPipeline(FIELDS, "2024-08-01", [lambda df: sizes.append(len(df))], batch_size=10)
+    threads = [threading.Thread(target=lambda start=start: [pipeline.write(record) for record in records(50, start)]) for start in range(0, 200, 50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pipeline.close()
+
+    assert sizes == [10] * 20
+
+
+def test_pipeline_streams_to_csv(tmp_path):
+    filename = str(tmp_path / "raw")
+    with CsvStreamWriter(filename, ["School ID", "URL"] + FIELDS + ["execution_date"]) as writer:
+        with RecordPipeline(FIELDS, "2024-08-01", [writer.write_frame], batch_size=2) as pipeline:
+            for record in records(3):
+                pipeline.write(record)
+
+    df = pd.read_csv(f"{filename}.csv", dtype=str)
+    assert df["School ID"].tolist() == ["00", "01", "02"]
+    assert df["name"].tolist() == ["School 0", "School 1", "School 2"]
+    assert df["phone"].isna().all()
@@ -0,0 +1,60 @@
+import pytest
+import requests
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from tools.retry_policy import RetryPolicy, classify_error, TRANSIENT, PERMANENT
+
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("error", [
+    TimeoutException(),
+    requests.ConnectionError(),
+    http_error(503),
+    http_error(429),
+    WebDriverException("chrome not reachable: disconnected"),
+    WebDriverException("session deleted because of page crash")
+])
+def test_transient_errors(error):
+    assert classify_error(error) == TRANSIENT
+
+
+@pytest.mark.parametrize("error", [
+    NoSuchElementException(),
+    ValueError("Key field 'Company' is empty"),
+    http_error(404),
+    WebDriverException("invalid argument")
+])
+def test_permanent_errors(error):
+    assert classify_error(error) == PERMANENT
+
+
+def test_transient_cause_makes_the_error_transient():
+    try:
+        try:
+            raise TimeoutException()
+        except TimeoutException as e:
+            raise Exception("Failed to scrape URL") from e
+    except Exception as e:
+        assert classify_error(e) == TRANSIENT
+
+
+def test_only_transient_errors_are_retried_within_the_attempts():
+    policy = RetryPolicy(max_attempts=3)
+
+    assert policy.should_retry(TimeoutException(), 1)
+    assert policy.should_retry(TimeoutException(), 2)
+    assert not policy.should_retry(TimeoutException(), 3)
+    assert not policy.should_retry(NoSuchElementException(), 1)
+
+
+def test_delay_is_jittered_below_the_exponential_backoff():
+    policy = RetryPolicy(base_delay=2, max_delay=5)
+
+    for _ in range(100):
+        assert 0 <= policy.delay(1) <= 2
+        assert 0 <= policy.delay(2) <= 4
+        assert 0 <= policy.delay(10) <= 5
@@ -0,0 +1,74 @@
+import time
+import threading
+import pytest
+from browser.provider.shared_browser_pool import SharedBrowserPool
+
+URLS = [f"https://txschools.gov/?view=school&id={school_id}" for school_id in range(6)]
+OTHER_URLS = [f"https://other.gov/school/{school_id}" for school_id in range(6)]
+
+
+@pytest.fixture
+def pool(session_manager):
+    pool = SharedBrowserPool(3, session_manager)
+    pool.start()
+    yield pool
+    pool.close()
+
+
+def run_site(site, handler, urls):
+    site.start(handler)
+    for url in urls:
+        site.submit(url)
+    return site.join()
+
+
+def test_sites_share_the_workers(pool, session_manager):
+    processed = []
+    lock = threading.Lock()
+
+    def handler(session, url):
+        with lock:
+            processed.append(url)
+
+    sites = [pool.site("txschools"), pool.site("other")]
+    threads = [threading.Thread(target=run_site, args=(site, handler, urls)) for site, urls in zip(sites, (URLS, OTHER_URLS))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(processed) == sorted(URLS + OTHER_URLS)
+    assert len(session_manager.sessions) == 3
+
+
+def test_site_rate_limit_paces_only_its_own_urls(pool):
+    finished = {}
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def handler(session, url):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+
+    def run(site, urls):
+        started = time.monotonic()
+        run_site(site, handler if site.name == "txschools" else lambda session, url: None, urls)
+        finished[site.name] = time.monotonic() - started
+
+    limited = pool.site("txschools", rate_limit={"requests_per_second": 20, "burst": 1, "max_in_flight": 1})
+    threads = [threading.Thread(target=run, args=args) for args in ((limited, URLS), (pool.site("other"), OTHER_URLS))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    # The first URL takes the initial token, the five others wait 1/20s each, while the other site is not held up.
+    assert finished["txschools"] >= 0.2
+    assert finished["other"] < 0.1
+    assert max_in_flight == 1
@@ -0,0 +1,66 @@
+import pytest
+import pandas as pd
+from tools.storage_backend import get_storage_backend
+
+HEADERS = ["School ID", "Company", "District", "execution_date"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = get_storage_backend("sqlite", str(tmp_path / "schools"), HEADERS, indexed_columns=["District"])
+    yield store
+    store.close()
+
+
+def rows(execution_date, *records, change_type=None):
+    df = pd.DataFrame([{"School ID": school_id, "Company": company, "District": "AUSTIN ISD", "execution_date": execution_date}
+                       for school_id, company in records])
+    if change_type:
+        df["change_type"] = change_type
+    return df
+
+
+def test_records_are_upserted_by_key_with_their_history(store):
+    store.save_data(rows("2024-08-01", ("1", "Old Name"), ("2", "Other School")))
+    store.save_data(rows("2024-09-01", ("1", "New Name")))
+
+    assert store.get("1")["Company"] == "New Name"
+    assert store.get_history("1")["Company"].tolist() == ["Old Name", "New Name"]
+    assert len(store.read_data()) == 2
+    assert store.get("3") is None
+
+
+def test_older_records_do_not_overwrite_newer_ones(store):
+    store.save_data(rows("2024-09-01", ("1", "New Name")))
+    store.save_data(rows("2024-08-01", ("1", "Old Name")))
+
+    assert store.get("1")["Company"] == "New Name"
+    assert len(store.get_history("1")) == 2
+
+
+def test_deletions_remove_the_latest_record(store):
+    store.save_data(rows("2024-08-01", ("1", "School"), ("2", "Other School")))
+    store.save_data(rows("2024-09-01", ("1", None), change_type="delete"))
+
+    assert store.read_data(columns=["School ID"])["School ID"].tolist() == ["2"]
+    assert store.get_history("1")["change_type"].fillna("upsert").tolist() == ["upsert", "delete"]
+
+
+def test_reads_filter_on_known_columns_only(store):
+    store.save_data(rows("2024-08-01", ("1", "School")))
+
+    assert store.read_data(where={"District": "AUSTIN ISD"})["School ID"].tolist() == ["1"]
+    with pytest.raises(ValueError):
+        store.read_data(where={"Unknown": "value"})
+    with pytest.raises(ValueError):
+        store.save_data(pd.DataFrame({"Company": ["School"]}))
+
+
+def test_store_survives_reopening(tmp_path, store):
+    store.save_data(rows("2024-08-01", ("1", "School")))
+    store.close()
+
+    reopened = get_storage_backend("sqlite", str(tmp_path / "schools"), HEADERS)
+
+    assert reopened.get("1")["Company"] == "School"
+    reopened.close()
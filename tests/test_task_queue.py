@@ -0,0 +1,71 @@
+import pytest
+from tools.task_queue import SqliteTaskQueue, READY, DONE, DEAD
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SqliteTaskQueue(str(tmp_path / "queue"), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_ignores_duplicate_keys(queue):
+    assert queue.enqueue("enrich", [("a", {"url": "a"}), ("b", {"url": "b"})]) == 2
+    assert queue.enqueue("enrich", [("a", {"url": "a"})]) == 0
+    assert queue.counts("enrich") == {READY: 2}
+
+
+def test_lease_hands_each_task_to_one_worker(queue):
+    queue.enqueue("enrich", [("a", {"url": "a"}), ("b", {"url": "b"})])
+
+    first = queue.lease("enrich", "worker-1", visibility_timeout=60)
+    second = queue.lease("enrich", "worker-2", visibility_timeout=60)
+
+    assert (first.key, first.payload, first.attempts) == ("a", {"url": "a"}, 1)
+    assert second.key == "b"
+    assert queue.lease("enrich", "worker-3", visibility_timeout=60) is None
+    assert queue.ack(first) and queue.ack(second)
+    assert queue.counts("enrich") == {DONE: 2}
+    assert not queue.has_work(["enrich"])
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(queue):
+    queue.enqueue("enrich", [("a", {"url": "a"})])
+    dead_worker_task = queue.lease("enrich", "worker-1", visibility_timeout=0)
+
+    reclaimed = queue.lease("enrich", "worker-2", visibility_timeout=60)
+
+    assert reclaimed.key == "a" and reclaimed.attempts == 2
+    # The first worker lost its lease, so it can no longer acknowledge or extend the task.
+    assert not queue.ack(dead_worker_task)
+    assert not queue.extend(dead_worker_task, 60)
+    assert queue.ack(reclaimed)
+
+
+def test_task_is_dead_once_its_leases_keep_expiring(queue):
+    queue.enqueue("enrich", [("a", {"url": "a"})])
+    queue.lease("enrich", "worker-1", visibility_timeout=0)
+    queue.lease("enrich", "worker-2", visibility_timeout=0)
+
+    assert queue.lease("enrich", "worker-3", visibility_timeout=60) is None
+    assert queue.counts("enrich") == {DEAD: 1}
+
+
+def test_nack_requeues_the_task_after_its_delay(queue):
+    queue.enqueue("enrich", [("a", {"url": "a"})])
+    task = queue.lease("enrich", "worker-1", visibility_timeout=60)
+
+    assert queue.nack(task, "timeout", delay=60)
+    assert queue.lease("enrich", "worker-1", visibility_timeout=60) is None
+    assert queue.has_work(["enrich"])
+
+
+def test_nack_marks_the_task_dead_after_max_attempts(queue):
+    queue.enqueue("enrich", [("a", {"url": "a"})])
+    assert queue.nack(queue.lease("enrich", "worker-1", visibility_timeout=60), "timeout")
+
+    task = queue.lease("enrich", "worker-1", visibility_timeout=60)
+    assert task.attempts == 2
+    assert queue.nack(task, "timeout")
+    assert queue.counts("enrich") == {DEAD: 1}
+    assert not queue.has_work(["enrich"])
@@ -0,0 +1,50 @@
+import pandas as pd
+from tools.html_parser import extract_fields_from_html
+from tools.record_pipeline import RawRecord, RecordBatch
+
+
+def raw_frame(scraper, records, change_types=False):
+    return RecordBatch("2024-08-01T10:00:00", records).to_frame(scraper.configs["extraction"]["fields"], change_types)
+
+
+def test_post_process_splits_the_raw_fields(scraper, configs, schools):
+    fields = extract_fields_from_html(schools[0].html, scraper.detail_selectors, configs["extraction"]["attributes"])
+    record = scraper._build_raw_record(f"https://txschools.gov/?view=school&id={schools[0].id}", fields)
+
+    row = scraper.post_process(raw_frame(scraper, [record])).iloc[0]
+
+    assert row["School ID"] == schools[0].id
+    assert row["Company"] == schools[0].name
+    assert row["District"] == schools[0].district
+    assert row["City"] == schools[0].city
+    assert row["State"] == "TX"
+    assert len(row["ZIP Code"]) == 5
+    assert not row["District Error"] and not row["Address Error"] and not row["Phone Error"]
+    assert row["execution_date"] == "2024-08-01T10:00:00"
+    assert list(row.index) == configs["consolidation"]["columns"] + ["execution_date"]
+
+
+def test_post_process_flags_unparseable_values(scraper):
+    values = ("School", "no grades here", "ADDRESS:\nnowhere", None, None, None)
+    row = scraper.post_process(raw_frame(scraper, [RawRecord("020905102", "url", values)])).iloc[0]
+
+    assert row["School ID"] == "020905102"
+    assert row["Company"] == "School"
+    assert row["District Error"] and row["Address Error"] and row["Phone Error"]
+    assert pd.isna(row["City"]) and pd.isna(row["Phone"])
+
+
+def test_post_process_passes_deletions_through(scraper):
+    fields = scraper.configs["extraction"]["fields"]
+    records = [
+        RawRecord("1", "url", ("School", None, None, "PHONE:\n(512) 555-0100", None, None), "upsert"),
+        RawRecord("2", None, (None,) * len(fields), "delete")
+    ]
+    scraper.incremental = True
+
+    processed = scraper.post_process(raw_frame(scraper, records, change_types=True))
+
+    assert processed["School ID"].tolist() == ["1", "2"]
+    assert processed["change_type"].tolist() == ["upsert", "delete"]
+    assert processed.loc[0, "Phone"] == "(512) 555-0100"
+    assert processed.loc[1].drop(["School ID", "change_type", "execution_date"]).isna().all()